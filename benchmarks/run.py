@@ -0,0 +1,207 @@
+"""Benchmarks for the simulation engine and the Streamlit rerun path.
+
+    python -m benchmarks.run --save    # record a baseline for this machine
+    python -m benchmarks.run --check   # fail if anything regressed
+
+Engine benchmarks measure simulated years per second for the game rules
+(``game_mode_v3_final.py``) and the policy pricing behind ``main.py`` at
+10^3 to 10^7 paths. Rerun benchmarks drive each app headlessly through
+Streamlit's ``AppTest`` and time a slider change, a simulate click and a
+restart, or for the leaderboard and tower pages a fresh load and a slider
+change; an app that raises fails the run. Baselines are
+machine-specific, so they live in an untracked ``benchmarks/baseline.json``.
+The games played during the rerun benchmarks go to a leaderboard and event
+log in a temporary directory, never to ``data/``.
+"""
+
+import argparse
+import atexit
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Both sinks read their location when first imported, so point them away
+# from data/ before anything imports ocean_risk. Registered first, the
+# cleanup runs after the event log's own exit flush.
+_SINK_DIR = tempfile.mkdtemp(prefix="ocean-risk-benchmarks-")
+atexit.register(shutil.rmtree, _SINK_DIR, ignore_errors=True)
+os.environ["OCEAN_RISK_LEADERBOARD"] = os.path.join(_SINK_DIR, "leaderboard.sqlite3")
+os.environ["OCEAN_RISK_EVENT_LOG"] = os.path.join(_SINK_DIR, "events")
+
+from ocean_risk.core import GAME_YEARS
+from ocean_risk.leaderboard import get_leaderboard
+from ocean_risk.playthrough import Strategy, simulate_playthroughs
+from ocean_risk.pricing import simulate_policy
+from ocean_risk.rng import stream
+from ocean_risk.state import GameState
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+PATH_COUNTS = [10**3, 10**4, 10**5, 10**6, 10**7]
+DEFAULT_TOLERANCE = 20.0  # percent
+
+GAME_SCRIPTS = [
+    "game_mode.py",
+    "game_mode_v2.py",
+    "game_mode_v3.py",
+    "game_mode_v3_final.py",
+    "game_mode_v3_fixed_style.py",
+    "game_mode_v3_radio_fix.py",
+    "game_mode_v3_readable.py",
+]
+POLICY_SCRIPTS = ["main.py", "educational_main.py"]
+# Pages without a simulate button, with the slider change timed on each.
+PAGE_SCRIPTS = {
+    "leaderboard.py": lambda at, v: at.slider[0].set_value(10 + v),  # rows shown
+    "tower_pricing.py": lambda at, v: at.slider[1].set_value(2 + v),  # number of layers
+}
+
+
+def _best_of(repeats, fn):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def engine_benchmarks(path_counts=PATH_COUNTS, repeats=3):
+    results = {}
+    for n in path_counts:
+        seconds = _best_of(repeats, lambda: simulate_playthroughs("Belize", Strategy(), n, seed=0))
+        results[f"game years/s @ {n:.0e} paths"] = (n * GAME_YEARS / seconds, "years/s")
+        seconds = _best_of(repeats, lambda: simulate_policy(500, "Medium", 5, 50, 100, n_years=n,
+                                                            rng=stream(0)))
+        results[f"pricing years/s @ {n:.0e} paths"] = (n / seconds, "years/s")
+    return results
+
+
+class AppError(Exception):
+    """An app raised while being benchmarked, so its timings mean nothing."""
+
+
+def _run(at, script):
+    at.run()
+    if at.exception:
+        raise AppError(f"{script}: {at.exception[0].message}")
+    return at
+
+
+def _start_game(script):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT / script), default_timeout=60)
+    if script.startswith("game_mode_v3"):
+        at.session_state.game = GameState(seed=0)
+        # Pick a scenario and get past the intro the way a player would.
+        _run(at, script)
+        at.radio[0].set_value("Belize")
+        at.radio[1].set_value("Insurance Advisor")
+        at.button[0].click()  # ✅ Start Simulation
+        _run(at, script)
+        at.button[0].click()  # 🚀 Start Year 1
+    else:
+        at.session_state.game = GameState(round=1, storm_chance=0.6, reef_value=500, seed=0)
+    _run(at, script)
+    return at
+
+
+def _time_rerun(at, script, action):
+    start = time.perf_counter()
+    action(at)
+    _run(at, script)
+    return time.perf_counter() - start
+
+
+def rerun_benchmarks(repeats=5):
+    from streamlit.testing.v1 import AppTest
+
+    results = {}
+    for script in POLICY_SCRIPTS:
+        at = _run(AppTest.from_file(str(ROOT / script), default_timeout=60), script)
+        slider = [_time_rerun(at, script, lambda at, v=v: at.slider[0].set_value(100 + v)) for v in range(repeats)]
+        click = [_time_rerun(at, script, lambda at: at.button[0].click()) for _ in range(repeats)]
+        results[f"{script} slider change"] = (statistics.median(slider) * 1000, "ms")
+        results[f"{script} simulate click"] = (statistics.median(click) * 1000, "ms")
+
+    for script in GAME_SCRIPTS:
+        slider, click, restart = [], [], []
+        for _ in range(repeats):
+            at = _start_game(script)
+            slider.append(_time_rerun(at, script, lambda at: at.slider[0].set_value(10)))
+            for _ in range(GAME_YEARS):
+                click.append(_time_rerun(at, script, lambda at: at.button[0].click()))
+            restart.append(_time_rerun(at, script, lambda at: at.button[-1].click()))
+        results[f"{script} slider change"] = (statistics.median(slider) * 1000, "ms")
+        results[f"{script} simulate click"] = (statistics.median(click) * 1000, "ms")
+        results[f"{script} restart"] = (statistics.median(restart) * 1000, "ms")
+
+    get_leaderboard().flush()  # so the leaderboard page shows the games just played
+    for script, change in PAGE_SCRIPTS.items():
+        load, slider = [], []
+        for v in range(repeats):
+            start = time.perf_counter()
+            at = _run(AppTest.from_file(str(ROOT / script), default_timeout=60), script)
+            load.append(time.perf_counter() - start)
+            slider.append(_time_rerun(at, script, lambda at, v=v: change(at, v)))
+        results[f"{script} load"] = (statistics.median(load) * 1000, "ms")
+        results[f"{script} slider change"] = (statistics.median(slider) * 1000, "ms")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Return descriptions of every metric more than ``tolerance`` % worse than baseline."""
+    regressions = []
+    for name, (value, unit) in results.items():
+        if name not in baseline:
+            continue
+        reference = baseline[name]["value"]
+        # Throughput should not drop; latency should not rise.
+        change = (reference - value) / reference if unit == "years/s" else (value - reference) / reference
+        if change * 100 > tolerance:
+            regressions.append(f"{name}: {value:,.1f} {unit} vs baseline {reference:,.1f} ({change:+.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--save", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown in percent (default %(default)s)")
+    parser.add_argument("--max-paths", type=int, default=PATH_COUNTS[-1])
+    parser.add_argument("--skip-reruns", action="store_true", help="engine benchmarks only")
+    args = parser.parse_args(argv)
+
+    results = engine_benchmarks([n for n in PATH_COUNTS if n <= args.max_paths])
+    if not args.skip_reruns:
+        try:
+            results.update(rerun_benchmarks())
+        except AppError as error:
+            sys.exit(f"App raised during the rerun benchmarks: {error}")
+    for name, (value, unit) in results.items():
+        print(f"{name:<48} {value:>16,.1f} {unit}")
+
+    if args.save:
+        BASELINE.write_text(json.dumps(
+            {name: {"value": value, "unit": unit} for name, (value, unit) in results.items()}, indent=2))
+        print(f"Saved baseline to {BASELINE}")
+    if args.check:
+        if not BASELINE.exists():
+            sys.exit(f"No baseline at {BASELINE}; run with --save first.")
+        regressions = compare(results, json.loads(BASELINE.read_text()), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:g}%.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,35 @@
 
+import altair as alt
+import numpy as np
+import pandas as pd
 import streamlit as st
-import random
+
+from ocean_risk import (
+    REGIONS,
+    RISK_CHANCES,
+    draw_storm,
+    draw_wind_speed,
+    is_triggered,
+    payout_amount,
+    premium_amount,
+    simulate_policy,
+)
+from ocean_risk.basis import build_basis_surface
+from ocean_risk.instrumentation import rerun_timer
+from ocean_risk.rng import BASIS_SURFACE, PRICING, SHARED_SEED, new_seed, stream, year_rng
+from ocean_risk.tail import exact_tail_risk
+
+timer = rerun_timer(__file__)
+timer.section("setup")
 
 st.set_page_config(page_title="YLOG: Ocean Risk Insurance Simulator", layout="wide")
 
+if "seed" not in st.session_state:
+    st.session_state.seed = new_seed()
+    st.session_state.runs = 0
+
 # --- Custom CSS for a clean ocean-blue theme ---
+timer.section("styling")
 st.markdown("""
     <style>
     html, body, [class*="css"]  {
@@ -25,12 +50,14 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- Title ---
+timer.section("intro")
 st.title("🌊 YLOG: Ocean Risk Insurance Simulator")
 st.subheader("Learn how insurance can help protect coral reefs and mangroves from extreme storms.")
 
 st.markdown("---")
 
 # --- SECTION 1: Educational Intro ---
+timer.section("glossary")
 with st.expander("🧠 Learn the Key Terms (Click to Expand)", expanded=False):
     st.markdown("""
     - **Premium**: The fee you pay regularly for insurance coverage. Think of it like a subscription that ensures fast response after disasters.
@@ -41,6 +68,7 @@ with st.expander("🧠 Learn the Key Terms (Click to Expand)", expanded=False):
     """)
 
 # --- SECTION 2: Design Insurance Policy ---
+timer.section("sliders")
 st.header("🔧 Step 1: Design Your Insurance Policy")
 
 col1, col2 = st.columns(2)
@@ -56,19 +84,21 @@ with col2:
 st.markdown("💡 _Tip: Lower trigger speeds make insurance more likely to pay out but can increase premiums._")
 
 # --- SECTION 3: Run Simulation ---
+timer.section("simulation")
 st.header("🌪️ Step 2: Simulate a Storm Event")
 if st.button("Run Simulation"):
     st.markdown("🎲 Rolling the dice... a storm is forming over your reef!")
-    risk_chances = {"Low": 0.2, "Medium": 0.5, "High": 0.8}
-    storm_happens = random.random() < risk_chances[storm_risk]
-    wind_speed = random.randint(70, 180)
+    st.session_state.runs += 1
+    rng = year_rng(st.session_state.seed, st.session_state.runs)
+    storm_happens = draw_storm(RISK_CHANCES[storm_risk], rng=rng)
+    wind_speed = draw_wind_speed(rng=rng)
 
     st.markdown(f"**Storm Wind Speed:** `{wind_speed}` knots")
 
     if storm_happens:
         st.error("A storm has hit your reef! 🌊")
-        if wind_speed >= trigger_speed:
-            payout = (payout_percent / 100) * reef_value
+        if is_triggered(wind_speed, trigger_speed):
+            payout = payout_amount(payout_percent, reef_value)
             st.success(f"✅ Trigger met! Insurance pays out **${payout:.2f} million** for ecosystem recovery.")
         else:
             st.warning("⚠️ Storm occurred but **did not meet the trigger threshold**. No payout was made. This is an example of **basis risk**.")
@@ -76,13 +106,89 @@ if st.button("Run Simulation"):
         st.success("☀️ No storm occurred. Your reef remains safe and healthy!")
 
 # --- SECTION 4: Summary ---
+timer.section("summary")
 st.header("📊 Step 3: Policy Summary")
-premium_paid = (premium_percent / 100) * reef_value
+premium_paid = premium_amount(premium_percent, reef_value)
 
 st.markdown(f"- **Ecosystem Value**: `${reef_value} million`")
 st.markdown(f"- **Premium Paid**: `${premium_paid:.2f} million`")
 st.markdown(f"- **Trigger Point**: `{trigger_speed} knots`")
-st.markdown(f"- **Potential Payout**: `{(payout_percent / 100) * reef_value:.2f} million`")
+st.markdown(f"- **Potential Payout**: `{payout_amount(payout_percent, reef_value):.2f} million`")
+
+stats = simulate_policy(reef_value, storm_risk, premium_percent, payout_percent, trigger_speed,
+                        rng=stream(st.session_state.seed, PRICING))
+st.markdown(f"- **Expected Annual Payout**: `${stats.expected_payout:.2f} million`")
+st.markdown(f"- **Chance of a Payout Each Year**: `{stats.trigger_probability:.1%}`")
+st.markdown(f"- **Loss Ratio (payout ÷ premium)**: `{stats.loss_ratio:.2f}`")
+st.caption(f"Expected values are averaged over {stats.n_years:,} simulated storm years.")
+
+
+# Exact, from the per-knot storm distribution: microseconds, so no cache.
+risk = exact_tail_risk(reef_value, storm_risk, payout_percent, trigger_speed)
+st.markdown("**How bad can a year get?**")
+for years, (damage, uncovered) in risk.return_period_losses().items():
+    st.markdown(f"- **1-in-{years} Year Storm Damage**: `${damage:.1f} million`, "
+                f"of which `${uncovered:.1f} million` is not covered by the payout")
+damage, uncovered = risk.tvar(100)
+st.markdown(f"- **Average Damage in the Worst 1% of Years (TVaR)**: `${damage:.1f} million`, "
+            f"`${uncovered:.1f} million` not covered")
+st.caption("A 1-in-100 year loss is the damage a year exceeds with a 1% chance. Damage is the share of "
+           "the ecosystem destroyed at the storm's wind speed.")
+
+# --- SECTION 5: Basis Risk ---
+timer.section("basis_risk")
+
+
+@st.cache_resource
+def basis_surfaces():
+    return {region: build_basis_surface(region, rng=stream(SHARED_SEED, BASIS_SURFACE, preset.id))
+            for region, preset in REGIONS.items()}
+
+
+st.header("🎯 Step 4: Where Does Basis Risk Hide?")
+st.markdown("Parametric insurance pays on **wind speed**, but reefs suffer **damage**. "
+            "Pick a region to see how often the two disagree for every possible policy.")
+
+region = st.selectbox("🌍 Reef region", list(REGIONS))
+surface = basis_surfaces()[region]
+figures = surface.lookup(trigger_speed, payout_percent)
+
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("🌪️ Damage and payout", f"{figures['both']:.1%}")
+col2.metric("⚠️ Damage, no payout", f"{figures['damage_only']:.1%}")
+col3.metric("💸 Payout, little damage", f"{figures['payout_only']:.1%}")
+col4.metric("☀️ Neither", f"{figures['neither']:.1%}")
+st.caption("Chance per year for your trigger. A storm counts as damaging when it destroys at least "
+           "5% of the reef's value.")
+
+metrics = {
+    "Uncovered loss (% of value per year)": surface.uncovered_loss_percent,
+    "Payout beyond the loss (% of value per year)": surface.excess_payout_percent,
+    "Chance of damage with no payout": surface.damage_only[:, None].repeat(len(surface.payouts), axis=1),
+}
+metric = st.radio("Colour the map by", list(metrics), horizontal=True)
+trigger_grid, payout_grid = np.meshgrid(surface.triggers, surface.payouts, indexing="ij")
+grid = pd.DataFrame({
+    "Trigger (knots)": trigger_grid.ravel(),
+    "Payout (% of value)": payout_grid.ravel(),
+    metric: metrics[metric].ravel(),
+})
+heatmap = alt.Chart(grid).mark_rect().encode(
+    x=alt.X("Trigger (knots):O", axis=alt.Axis(values=list(range(80, 161, 10)))),
+    y=alt.Y("Payout (% of value):O", sort="descending", axis=alt.Axis(values=list(range(10, 101, 10)))),
+    color=alt.Color(f"{metric}:Q", scale=alt.Scale(scheme="blues")),
+    tooltip=["Trigger (knots)", "Payout (% of value)", alt.Tooltip(f"{metric}:Q", format=".3f")],
+)
+current = pd.DataFrame({"Trigger (knots)": [trigger_speed], "Payout (% of value)": [payout_percent]})
+policy = alt.Chart(current).mark_point(shape="diamond", size=120, color="#e85d04", filled=True).encode(
+    x="Trigger (knots):O",
+    y=alt.Y("Payout (% of value):O", sort="descending"),
+)
+st.altair_chart(heatmap + policy)
+st.caption("🔶 marks your policy. Lower triggers cut missed damage but pay out for weaker storms; "
+           "bigger payouts close the gap at a higher premium.")
 
 st.markdown("---")
 st.caption("Designed for the Young Leaders in Ocean Governance Program • Powered by AXA & TNC case studies")
+
+timer.finish()
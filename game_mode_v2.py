@@ -1,17 +1,23 @@
 
 import streamlit as st
-import random
+
+from ocean_risk import V2_RULES
+from ocean_risk.eventlog import log_year
+from ocean_risk.instrumentation import rerun_timer
+from ocean_risk.state import GameState
+
+timer = rerun_timer(__file__)
+timer.section("setup")
 
 st.set_page_config(page_title="🌊 YLOG Coastal Resilience Game", layout="wide")
 
 # Initialize session state
-if "round" not in st.session_state:
-    st.session_state.round = 1
-    st.session_state.score = 50
-    st.session_state.ecosystem_health = 100
-    st.session_state.funds = 0
+if "game" not in st.session_state:
+    st.session_state.game = GameState(round=1, storm_chance=0.6, reef_value=500)
+game = st.session_state.game
 
 # --- Custom Styling for Blue Background and Gamified Feel ---
+timer.section("styling")
 st.markdown("""
 <style>
 body {
@@ -35,6 +41,7 @@ h1, h2, h3 {
 """, unsafe_allow_html=True)
 
 # --- Onboarding and Educational Explanation ---
+timer.section("intro")
 st.title("🌊 YLOG Ocean Risk Simulator: Coastal Resilience Game")
 st.markdown("Welcome, future ocean leader! You are about to step into the shoes of a **Coastal Resilience Strategist** for the fictional island nation of **Azurea**.")
 
@@ -58,9 +65,9 @@ Your job is to balance protection, cost, and timing — while building resilienc
 st.markdown("---")
 
 # --- Interactive Game Section ---
-st.header(f"🎮 Year {st.session_state.round}: Design Your Strategy")
+timer.section("sliders")
+st.header(f"🎮 Year {game.round}: Design Your Strategy")
 
-reef_value = 500  # static for simplicity
 col1, col2, col3 = st.columns(3)
 
 with col1:
@@ -73,51 +80,49 @@ with col3:
 st.markdown("🧠 _Tip: Lower trigger = more likely to get payout, but higher premiums. Higher trigger = lower cost, more risk._")
 
 # --- Simulate the Year ---
+timer.section("simulation")
 if st.button("▶️ Simulate Year"):
-    st.session_state.round += 1
-    storm_happens = random.random() < 0.6
-    wind_speed = random.randint(70, 180)
-    st.markdown(f"**🌪️ Actual Wind Speed This Year:** `{wind_speed} knots`")
+    year = game.play_year(premium, payout, trigger, V2_RULES)
+    log_year(__file__, game, year)
+    st.markdown(f"**🌪️ Actual Wind Speed This Year:** `{year.wind_speed} knots`")
 
-    if storm_happens:
+    if year.storm_occurs:
         st.error("⚠️ A major storm impacted Azurea’s coast!")
-        if wind_speed >= trigger:
-            payout_amount = (payout / 100) * reef_value
-            st.success(f"✅ Insurance triggered! You received ${payout_amount:.2f} million.")
-            st.session_state.funds += payout_amount
-            st.session_state.score += 5
+        st.markdown(f"🌿 Storm damage to reefs and mangroves: `{year.health_delta}` ecosystem health")
+        if year.triggered:
+            st.success(f"✅ Insurance triggered! You received ${year.payout_amount:.2f} million.")
         else:
             st.warning("🚫 Storm hit, but insurance didn’t trigger. Basis risk realized.")
-            st.session_state.ecosystem_health -= 15
-            st.session_state.score -= 5
     else:
         st.success("☀️ No storms this year — a peaceful season.")
-        st.session_state.score += 2
 
 st.markdown("---")
 
 # --- Scoreboard ---
+timer.section("dashboard")
 st.header("📊 Dashboard")
-st.markdown(f"- 🧭 Year: `{st.session_state.round}` / 5")
-st.markdown(f"- 🌿 Ecosystem Health: `{st.session_state.ecosystem_health}` / 100")
-st.markdown(f"- 💰 Recovery Funds: `${st.session_state.funds}` million")
-st.markdown(f"- 🎯 Resilience Score: `{st.session_state.score}` / 100")
+st.markdown(f"- 🧭 Year: `{game.round}` / 5")
+st.markdown(f"- 🌿 Ecosystem Health: `{game.ecosystem_health}` / 100")
+st.markdown(f"- 💰 Recovery Funds: `${game.funds}` million")
+st.markdown(f"- 🎯 Resilience Score: `{game.score}` / 100")
 
 # --- Game End ---
-if st.session_state.round > 5:
+timer.section("final_report")
+if game.round > 5:
     st.balloons()
     st.header("🏁 Simulation Complete!")
-    st.markdown(f"🌿 Final Ecosystem Health: `{st.session_state.ecosystem_health}`")
-    st.markdown(f"💰 Total Recovery Funds: `${st.session_state.funds}` million")
-    st.markdown(f"🎯 Final Resilience Score: `{st.session_state.score}` / 100")
+    st.markdown(f"🌿 Final Ecosystem Health: `{game.ecosystem_health}`")
+    st.markdown(f"💰 Total Recovery Funds: `${game.funds}` million")
+    st.markdown(f"🎯 Final Resilience Score: `{game.score}` / 100")
 
-    if st.session_state.score >= 80:
+    if game.score >= 80:
         st.success("🏆 Excellent strategy! Azurea’s coast is well protected.")
-    elif st.session_state.score >= 50:
+    elif game.score >= 50:
         st.info("👏 Decent effort — but Azurea remains vulnerable.")
     else:
         st.error("❌ The coast suffered significantly. Rework your strategy next time.")
 
     if st.button("🔄 Restart Simulation"):
-        for key in list(st.session_state.keys()):
-            del st.session_state[key]
+        del st.session_state.game
+
+timer.finish()
@@ -0,0 +1,80 @@
+import streamlit as st
+
+from ocean_risk import REGIONS
+from ocean_risk.instrumentation import rerun_timer
+from ocean_risk.leaderboard import get_leaderboard
+
+timer = rerun_timer(__file__)
+timer.section("setup")
+
+st.set_page_config(page_title="🏆 YLOG Ocean Risk Leaderboard", layout="wide")
+
+
+# Every open leaderboard tab shares these results for a few seconds, so a
+# full classroom refreshing at once runs each query only once.
+@st.cache_data(ttl=5)
+def top_games(limit, region):
+    return get_leaderboard().top_games(limit, region=region)
+
+
+@st.cache_data(ttl=5)
+def summary(by):
+    return get_leaderboard().summary(by)
+
+
+@st.cache_data(ttl=5)
+def decision_summary():
+    return get_leaderboard().decision_summary()
+
+
+st.title("🏆 Class Leaderboard")
+st.markdown("Finished games from **Game Mode v3** across every session.")
+if st.button("🔄 Refresh"):
+    st.cache_data.clear()
+
+# --- Top Games ---
+timer.section("top_games")
+col1, col2 = st.columns(2)
+with col1:
+    region = st.selectbox("🌐 Region", ["All regions", *REGIONS])
+with col2:
+    limit = st.slider("Show top", 5, 100, 20)
+
+games = top_games(limit, None if region == "All regions" else region)
+if not games:
+    st.info("No finished games yet. Play Game Mode v3 to get on the board!")
+    timer.finish()
+    st.stop()
+
+st.dataframe(
+    [{"Rank": rank, "Region": g["region"], "Role": g["role"], "🎯 Score": g["score"],
+      "🌿 Health": g["ecosystem_health"], "💰 Funds ($M)": round(g["funds"], 2)}
+     for rank, g in enumerate(games, start=1)],
+    hide_index=True,
+)
+
+# --- Averages ---
+timer.section("averages")
+st.header("📊 How Each Scenario Went")
+col1, col2 = st.columns(2)
+for col, by in ((col1, "region"), (col2, "role")):
+    with col:
+        st.subheader(f"By {by}")
+        st.dataframe(
+            [{by.title(): row[by], "Games": row["games"], "Avg score": round(row["avg_score"], 1),
+              "Best score": row["best_score"], "Avg health": round(row["avg_health"], 1),
+              "Avg funds ($M)": round(row["avg_funds"], 2)}
+             for row in summary(by)],
+            hide_index=True,
+        )
+
+st.subheader("🧭 Typical Decisions")
+st.dataframe(
+    [{"Region": row["region"], "Avg premium %": round(row["avg_premium"], 1),
+      "Avg payout %": round(row["avg_payout"], 1), "Avg trigger (knots)": round(row["avg_trigger"]),
+      "Trigger rate": f"{row['trigger_rate']:.0%}"}
+     for row in decision_summary()],
+    hide_index=True,
+)
+
+timer.finish()
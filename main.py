@@ -1,9 +1,31 @@
 
+import pandas as pd
 import streamlit as st
-import random
+
+from ocean_risk import (
+    RISK_CHANCES,
+    build_premium_surface,
+    draw_wind_speed,
+    is_triggered,
+    payout_amount,
+    premium_amount,
+    simulate_policy_adaptive,
+)
+from ocean_risk.climate import project_policy
+from ocean_risk.instrumentation import rerun_timer
+from ocean_risk.rng import CLIMATE, PREMIUM_SURFACE, PRICING, SHARED_SEED, new_seed, stream, year_rng
+from ocean_risk.tail import exact_tail_risk
+
+timer = rerun_timer(__file__)
+timer.section("setup")
 
 st.set_page_config(page_title="Ocean Risk Simulator", layout="wide")
 
+if "seed" not in st.session_state:
+    st.session_state.seed = new_seed()
+    st.session_state.runs = 0
+
+timer.section("styling")
 st.markdown("""
 <style>
     body {
@@ -17,12 +39,14 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+timer.section("intro")
 st.title("🌊 Reef & Mangrove Parametric Insurance Simulator")
 
 st.markdown("Welcome to the first module of the **YLOG Ocean Finance Simulator**. "
             "In this simulation, you will design an insurance product for a coastal ecosystem and respond to climate events.")
 
 # --- Insurance Setup ---
+timer.section("sliders")
 st.header("🔧 Design Your Insurance Product")
 
 reef_value = st.slider("🌴 Ecosystem Value (in million USD)", 100, 1000, 500)
@@ -32,20 +56,96 @@ payout_percent = st.slider("💸 Insurance Payout (% of value)", 10, 100, 50)
 trigger_speed = st.slider("🌬️ Trigger Wind Speed (knots)", 80, 160, 100)
 
 # --- Simulation ---
+timer.section("simulation")
 st.header("🌪️ Simulate a Storm Event")
 
 if st.button("Run Simulation"):
-    storm_speed = random.randint(70, 180)
+    st.session_state.runs += 1
+    storm_speed = draw_wind_speed(rng=year_rng(st.session_state.seed, st.session_state.runs))
     st.markdown(f"**Storm Wind Speed:** {storm_speed} knots")
     
-    if storm_speed >= trigger_speed:
-        payout = (payout_percent / 100) * reef_value
+    if is_triggered(storm_speed, trigger_speed):
+        payout = payout_amount(payout_percent, reef_value)
         st.success(f"Insurance triggered! 🌊 You receive ${payout:.2f} million to restore the ecosystem.")
     else:
         st.warning("No payout triggered. The storm was not intense enough.")
 
 # --- Summary ---
+timer.section("summary")
 st.header("📊 Summary of Your Policy")
 st.write(f"**Ecosystem Value:** ${reef_value} million")
-st.write(f"**Premium Paid:** ${(premium_percent / 100) * reef_value:.2f} million")
+st.write(f"**Premium Paid:** ${premium_amount(premium_percent, reef_value):.2f} million")
 st.write(f"**Trigger Point:** {trigger_speed} knots")
+
+SAMPLERS = {"Importance sampling": "importance", "Antithetic pairs": "antithetic", "Plain": "plain"}
+accuracy = st.expander("⚙️ Simulation Accuracy")
+with accuracy:
+    tolerance = st.select_slider("Target standard error (% of the expected payout)",
+                                 [0.1, 0.2, 0.5, 1.0, 2.0], value=0.5)
+    sampler = st.radio("Sampler", list(SAMPLERS), horizontal=True)
+    st.caption("Storm years are simulated in batches until the estimate is this precise. Importance "
+               "sampling draws more of the storms strong enough to trigger, so rare payouts need far "
+               "fewer years.")
+
+stats = simulate_policy_adaptive(reef_value, storm_risk, premium_percent, payout_percent, trigger_speed,
+                                 tolerance / 100, SAMPLERS[sampler], rng=stream(st.session_state.seed, PRICING))
+with accuracy:
+    if stats.converged:
+        st.success(f"Reached the target after {stats.n_years:,} storm years.")
+    else:
+        st.warning(f"Stopped at the limit of {stats.n_years:,} storm years before reaching the target: "
+                   f"the estimate is only ± {stats.std_error:.2f} million. Try importance sampling.")
+st.write(f"**Expected Annual Payout:** ${stats.expected_payout:.2f} million (± {stats.std_error:.2f})")
+st.write(f"**Chance of a Payout Each Year:** {stats.trigger_probability:.1%}")
+st.write(f"**Loss Ratio (payout ÷ premium):** {stats.loss_ratio:.2f}")
+st.caption(f"Based on {stats.n_years:,} simulated storm years.")
+
+
+# Exact, from the per-knot storm distribution: microseconds, so no cache.
+risk = exact_tail_risk(reef_value, storm_risk, payout_percent, trigger_speed)
+for years, (damage, uncovered) in risk.return_period_losses().items():
+    st.write(f"**1-in-{years} Year Storm Damage:** \\${damage:.1f} million (\\${uncovered:.1f} million not covered)")
+damage, uncovered = risk.tvar(100)
+st.write(f"**Average Damage Beyond the 1-in-100 Year Loss (TVaR):** \\${damage:.1f} million "
+         f"(\\${uncovered:.1f} million not covered)")
+
+
+@st.cache_resource
+def premium_surfaces():
+    return {risk: build_premium_surface(risk, rng=stream(SHARED_SEED, PREMIUM_SURFACE, i))
+            for i, risk in enumerate(RISK_CHANCES)}
+
+
+fair_premium, _ = premium_surfaces()[storm_risk].lookup(trigger_speed, payout_percent)
+st.write(f"**Fair Premium:** {fair_premium:.1f}% of value")
+if premium_percent > fair_premium:
+    st.info(f"Your premium is {premium_percent - fair_premium:.1f} points above the fair price: the policy is overpriced.")
+elif premium_percent < fair_premium:
+    st.warning(f"Your premium is {fair_premium - premium_percent:.1f} points below the fair price: the policy is underpriced.")
+else:
+    st.success("Your premium matches the fair price.")
+
+# --- Climate Outlook ---
+timer.section("climate")
+st.header("🌡️ Climate Outlook")
+
+
+@st.cache_data(max_entries=64)
+def climate_outlook(storm_risk, trigger_speed, payout_percent, seed):
+    return project_policy(RISK_CHANCES[storm_risk], trigger_speed, payout_percent,
+                          rng=stream(seed, CLIMATE))
+
+
+outlook = climate_outlook(storm_risk, trigger_speed, payout_percent, st.session_state.seed)
+st.markdown(f"Storms are expected to grow more frequent and stronger. Here is how the fair premium of "
+            f"your policy, **{outlook.today_premium_percent:.1f}%** of value today, could change over the "
+            f"next {len(outlook.years)} years.")
+st.line_chart(pd.DataFrame(outlook.fair_premium_percent.T, index=pd.Index(outlook.years, name="Year"),
+                           columns=[scenario.name for scenario in outlook.scenarios]),
+              x_label="Year", y_label="Fair premium (% of value)")
+for scenario, change in zip(outlook.scenarios[1:], outlook.degradation()[1:]):
+    st.write(f"**{scenario.name}:** fair premium {change - 1:+.0%} by year {len(outlook.years)}")
+st.caption("A premium set today becomes underpriced as the climate warms: the trust fund would need to "
+           "charge more, or raise the trigger and accept more basis risk.")
+
+timer.finish()
@@ -0,0 +1,49 @@
+"""Headless simulation code shared by the Ocean Risk Simulator apps.
+
+The batch tools (``ocean_risk.playthrough``, ``ocean_risk.optimizer``,
+``ocean_risk.tracks``) also run as ``python -m`` commands and are imported
+from their own modules.
+"""
+
+from ocean_risk.core import (
+    GAME_MODE_RULES,
+    RISK_CHANCES,
+    ROLES,
+    V2_RULES,
+    V3_RULES,
+    ScoringRule,
+    draw_storm,
+    draw_wind_speed,
+    is_triggered,
+    payout_amount,
+    premium_amount,
+    score_year,
+)
+from ocean_risk.events import EventSet, build_event_sets
+from ocean_risk.pricing import PolicyStats, simulate_policy, simulate_policy_adaptive
+from ocean_risk.regions import REGIONS, Region
+from ocean_risk.surface import PremiumSurface, build_premium_surface
+
+__all__ = [
+    "GAME_MODE_RULES",
+    "REGIONS",
+    "RISK_CHANCES",
+    "ROLES",
+    "V2_RULES",
+    "V3_RULES",
+    "EventSet",
+    "PolicyStats",
+    "PremiumSurface",
+    "Region",
+    "ScoringRule",
+    "build_event_sets",
+    "build_premium_surface",
+    "draw_storm",
+    "draw_wind_speed",
+    "is_triggered",
+    "payout_amount",
+    "premium_amount",
+    "score_year",
+    "simulate_policy",
+    "simulate_policy_adaptive",
+]
@@ -0,0 +1,85 @@
+"""Bundled, content-addressed images for the apps.
+
+Assets live in ``assets/`` under names that embed a hash of their bytes
+(``trust_fund_flow.6e1f8ca00cf3.svg``), and ``assets/manifest.json`` maps
+each logical name to its current file. A changed image gets a new file
+name, so anything serving these files can cache them forever. Nothing is
+fetched over the network.
+
+Add or update an asset with ``python -m ocean_risk.assets add FILE``.
+"""
+
+import argparse
+import functools
+import hashlib
+import json
+import shutil
+from pathlib import Path
+
+ASSET_DIR = Path(__file__).resolve().parent.parent / "assets"
+MANIFEST = ASSET_DIR / "manifest.json"
+HASH_CHARS = 12
+TEXT_SUFFIXES = {".svg"}
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:HASH_CHARS]
+
+
+@functools.lru_cache(maxsize=None)
+def manifest(asset_dir=ASSET_DIR):
+    """``{logical name: stored file name}`` for ``asset_dir``."""
+    path = Path(asset_dir) / MANIFEST.name
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def asset_path(name, asset_dir=ASSET_DIR):
+    try:
+        return Path(asset_dir) / manifest(asset_dir)[name]
+    except KeyError:
+        raise KeyError(f"no asset named {name!r} in {asset_dir}") from None
+
+
+def load_asset(name, asset_dir=ASSET_DIR):
+    """Contents of an asset: text for SVG, which ``st.image`` inlines; bytes otherwise."""
+    path = asset_path(name, asset_dir)
+    data = path.read_bytes()
+    return data.decode("utf-8") if path.suffix in TEXT_SUFFIXES else data
+
+
+def add_asset(source, name=None, asset_dir=ASSET_DIR):
+    """Store ``source`` under its content hash and point ``name`` at it; returns the file name."""
+    source, asset_dir = Path(source), Path(asset_dir)
+    name = name or source.stem
+    stored = f"{name}.{content_hash(source.read_bytes())}{source.suffix}"
+    asset_dir.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(source, asset_dir / stored)
+
+    entries = dict(manifest(asset_dir))
+    previous = entries.get(name)
+    entries[name] = stored
+    (asset_dir / MANIFEST.name).write_text(json.dumps(entries, indent=2, sort_keys=True) + "\n")
+    if previous and previous != stored:
+        (asset_dir / previous).unlink(missing_ok=True)
+    manifest.cache_clear()
+    return stored
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="store a file under its content hash")
+    add.add_argument("file")
+    add.add_argument("--name", help="logical name (default: the file's stem)")
+    commands.add_parser("list", help="list stored assets")
+    args = parser.parse_args(argv)
+
+    if args.command == "add":
+        print(add_asset(args.file, args.name))
+    else:
+        for name, stored in sorted(manifest().items()):
+            print(f"{name:<24} {stored}")
+
+
+if __name__ == "__main__":
+    main()
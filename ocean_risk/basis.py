@@ -0,0 +1,97 @@
+"""Basis risk of every trigger and payout slider setting for a region.
+
+Parametric cover pays on wind speed, while the reef suffers according to
+its fragility curves, and the two can disagree. For each trigger this module
+gives the chance per year of each combination:
+
+    both           damaging storm, and the policy pays
+    damage only    damaging storm below the trigger (the player's "basis risk")
+    payout only    the policy pays for a storm that did little damage
+    neither        no damaging storm and no payout
+
+A storm counts as damaging when it destroys at least ``DAMAGE_THRESHOLD``
+of the reef's value. For every (trigger, payout) pair it also gives the
+expected loss left uncovered and the expected payout beyond the loss.
+
+Like the premium surface, everything comes from one ``EventSet``: suffix
+sums over its sorted wind speeds answer all 81 x 91 slider settings in one
+pass.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from ocean_risk.events import EventSet
+from ocean_risk.pricing import DEFAULT_YEARS
+from ocean_risk.regions import REGIONS
+from ocean_risk.surface import PAYOUT_MAX, PAYOUT_MIN, TRIGGER_MAX, TRIGGER_MIN, grid_index
+from ocean_risk.tracks import region_wind
+
+DAMAGE_THRESHOLD = 0.05  # share of reef value
+
+
+def _suffix_sums(values):
+    """``out[i] = values[i:].sum(axis=0)``, with a trailing row of zeros."""
+    values = np.asarray(values, dtype=np.float64)
+    return np.concatenate([np.cumsum(values[::-1], axis=0)[::-1], np.zeros((1, *values.shape[1:]))])
+
+
+@dataclass(frozen=True)
+class BasisRiskSurface:
+    region: str
+    triggers: np.ndarray  # knots, shape (n_triggers,)
+    payouts: np.ndarray  # % of value, shape (n_payouts,)
+    both: np.ndarray  # chance per year, shape (n_triggers,)
+    damage_only: np.ndarray
+    payout_only: np.ndarray
+    neither: np.ndarray
+    uncovered_loss_percent: np.ndarray  # expected per year, shape (n_triggers, n_payouts)
+    excess_payout_percent: np.ndarray
+
+    def lookup(self, trigger_speed, payout_percent):
+        """All basis-risk figures for one policy, as a dict of floats."""
+        i, j = grid_index(trigger_speed, payout_percent)
+        return {
+            "both": float(self.both[i]),
+            "damage_only": float(self.damage_only[i]),
+            "payout_only": float(self.payout_only[i]),
+            "neither": float(self.neither[i]),
+            "uncovered_loss_percent": float(self.uncovered_loss_percent[i, j]),
+            "excess_payout_percent": float(self.excess_payout_percent[i, j]),
+        }
+
+
+def build_basis_surface(region, n_years=DEFAULT_YEARS, rng=None, damage_threshold=DAMAGE_THRESHOLD):
+    preset = REGIONS[region]
+    events = EventSet.simulate(preset.storm_chance, n_years, rng, region_wind(region))
+    triggers = np.arange(TRIGGER_MIN, TRIGGER_MAX + 1)
+    payouts = np.arange(PAYOUT_MIN, PAYOUT_MAX + 1)
+
+    # Storms per distinct wind speed, and each speed's share of reef value lost.
+    counts = -np.diff(events.at_or_above)
+    loss = preset.damage_fraction(events.speeds).astype(np.float64)
+    damaging = counts * (loss >= damage_threshold)
+    # Row i of a suffix sum covers every storm that reaches triggers[i].
+    first = np.searchsorted(events.speeds, triggers, side="left")
+
+    both = _suffix_sums(damaging)[first] / n_years
+    paid = events.trigger_probability(triggers)
+    damage_only = damaging.sum() / n_years - both
+    payout_only = paid - both
+
+    cover = payouts / 100
+    missed_loss = (counts * loss).sum() - _suffix_sums(counts * loss)[first]
+    shortfall = _suffix_sums(counts[:, None] * np.maximum(loss[:, None] - cover, 0))[first]
+    excess = _suffix_sums(counts[:, None] * np.maximum(cover - loss[:, None], 0))[first]
+    return BasisRiskSurface(
+        region=region,
+        triggers=triggers,
+        payouts=payouts,
+        both=both,
+        damage_only=damage_only,
+        payout_only=payout_only,
+        neither=1 - both - damage_only - payout_only,
+        uncovered_loss_percent=(missed_loss[:, None] + shortfall) / n_years * 100,
+        excess_payout_percent=excess / n_years * 100,
+    )
@@ -0,0 +1,143 @@
+"""Storm hazard under warming pathways over a multi-decade horizon.
+
+Each scenario ramps storm frequency and storm intensity linearly from
+today's climate to its change at the end of the horizon: in year ``t`` of
+a ``horizon`` of years the storm chance is multiplied by
+``1 + frequency_change * t / horizon`` and every wind speed by
+``1 + intensity_change * t / horizon``. The changes are round
+numbers in the range of published projections for tropical cyclones, for
+teaching rather than forecasting.
+
+``project_policy`` evaluates one policy under every scenario, year and
+path as a single ``(scenarios, years, paths)`` array computation. All
+scenarios share the same uniform draws (common random numbers), so the
+differences between them are not simulation noise.
+
+Run ``python -m ocean_risk.climate`` for a sweep over every region and
+trigger.
+"""
+
+import argparse
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from ocean_risk.core import WIND_MAX, WIND_MIN, is_triggered
+from ocean_risk.fragility import DEFAULT_FRAGILITY
+from ocean_risk.regions import REGIONS
+from ocean_risk.rng import CLIMATE, new_seed, stream
+from ocean_risk.tracks import region_wind
+
+HORIZON_YEARS = 30
+DEFAULT_PATHS = 20_000
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    frequency_change: float  # relative change in storm chance by the end of the horizon
+    intensity_change: float  # relative change in wind speed by the end of the horizon
+
+
+SCENARIOS = (
+    Scenario("Today's climate", 0.0, 0.0),
+    Scenario("Low emissions (SSP1-2.6)", 0.05, 0.03),
+    Scenario("Middle of the road (SSP2-4.5)", 0.10, 0.05),
+    Scenario("High emissions (SSP5-8.5)", 0.20, 0.10),
+)
+
+
+@dataclass(frozen=True)
+class ScenarioProjection:
+    """One policy's outlook, each array shaped ``(scenarios, years)``."""
+
+    scenarios: tuple
+    years: np.ndarray  # 1 .. horizon
+    trigger_probability: np.ndarray
+    fair_premium_percent: np.ndarray
+    expected_damage_percent: np.ndarray  # of ecosystem value per year
+    uncovered_damage_percent: np.ndarray  # damage beyond the payout, per year
+    today_premium_percent: float  # fair premium in today's climate, from every simulated year
+
+    def degradation(self):
+        """Fair premium in the last year relative to today's, per scenario."""
+        return self.fair_premium_percent[:, -1] / self.today_premium_percent
+
+
+def _hazard(scenarios, years, horizon):
+    """Frequency and intensity multipliers, each ``(scenarios, years)``."""
+    ramp = years / horizon
+    frequency = 1 + np.array([s.frequency_change for s in scenarios])[:, None] * ramp
+    intensity = 1 + np.array([s.intensity_change for s in scenarios])[:, None] * ramp
+    return frequency, intensity
+
+
+def project_policy(storm_chance, trigger_speed, payout_percent, wind=None, damage=None,
+                   scenarios=SCENARIOS, n_paths=DEFAULT_PATHS, horizon=HORIZON_YEARS, rng=None):
+    """Project a step policy over ``horizon`` years under each scenario.
+
+    ``wind`` is a region's ``WindTable`` (default: uniform between
+    ``WIND_MIN`` and ``WIND_MAX``) and ``damage`` maps wind speeds to the
+    share of the ecosystem destroyed (default: the fragility curves).
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    damage = DEFAULT_FRAGILITY.damage if damage is None else damage
+    years = np.arange(1, horizon + 1)
+    frequency, intensity = _hazard(scenarios, years, horizon)
+
+    storm_u = rng.random((horizon, n_paths), dtype=np.float32)
+    if wind is None:
+        base_wind = rng.integers(WIND_MIN, WIND_MAX + 1, (horizon, n_paths), dtype=np.int16)
+    else:
+        base_wind = wind.sample((horizon, n_paths), rng)
+    storm = storm_u < np.minimum(storm_chance * frequency, 1)[:, :, None]
+    wind_speed = np.rint(base_wind * intensity[:, :, None]).astype(np.int16)
+    lost = np.where(storm, damage(wind_speed), 0)
+    paid = storm & is_triggered(wind_speed, trigger_speed)
+
+    trigger_probability = paid.mean(axis=2)
+    today = (storm_u < storm_chance) & is_triggered(base_wind, trigger_speed)
+    return ScenarioProjection(
+        scenarios=tuple(scenarios),
+        years=years,
+        trigger_probability=trigger_probability,
+        fair_premium_percent=trigger_probability * payout_percent,
+        expected_damage_percent=lost.mean(axis=2) * 100,
+        uncovered_damage_percent=np.maximum(lost - paid * (payout_percent / 100), 0).mean(axis=2) * 100,
+        today_premium_percent=float(today.mean()) * payout_percent,
+    )
+
+
+def project_region(region, trigger_speed, payout_percent, **kwargs):
+    """``project_policy`` for a game region's storms and fragility curves."""
+    preset = REGIONS[region]
+    return project_policy(preset.storm_chance, trigger_speed, payout_percent, region_wind(region),
+                          preset.damage_fraction, **kwargs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--payout", type=int, default=60)
+    parser.add_argument("--paths", type=int, default=DEFAULT_PATHS)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    seed = new_seed() if args.seed is None else args.seed
+    start = time.perf_counter()
+    sweep = {(region, trigger): project_region(region, trigger, args.payout, n_paths=args.paths,
+                                               rng=stream(seed, CLIMATE, i))
+             for i, (region, trigger) in enumerate((r, t) for r in REGIONS for t in range(80, 161, 20))}
+    seconds = time.perf_counter() - start
+    print(f"seed {seed}: {len(sweep)} policies x {len(SCENARIOS)} scenarios x {HORIZON_YEARS} years "
+          f"x {args.paths:,} paths in {seconds:.1f}s")
+    print(f"Fair premium in year {HORIZON_YEARS} (% of value), and change from today:")
+    for (region, trigger), projection in sweep.items():
+        cells = "  ".join(f"{premium:5.1f} ({change - 1:+5.0%})" for premium, change in
+                          zip(projection.fair_premium_percent[:, -1], projection.degradation()))
+        print(f"  {region:<10} {trigger} kn  {cells}")
+    print("  columns: " + ", ".join(s.name for s in SCENARIOS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Storm, payout and scoring rules shared by every app.
+
+Everything here works on plain Python scalars for a single click in the
+apps and on NumPy arrays for batch runs, so the apps and the batch tools
+stay on exactly the same rules. Nothing in this package imports Streamlit.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from ocean_risk.fragility import DEFAULT_FRAGILITY
+
+WIND_MIN = 70
+WIND_MAX = 180
+RISK_CHANCES = {"Low": 0.2, "Medium": 0.5, "High": 0.8}
+
+GAME_YEARS = 5
+START_SCORE = 50
+START_HEALTH = 100
+
+_rng = np.random.default_rng()
+
+ROLES = ["Minister of Coastal Resilience", "Insurance Advisor", "Marine NGO Officer"]
+
+
+@dataclass(frozen=True)
+class ScoringRule:
+    """Score and ecosystem-health changes for one simulated year.
+
+    Every storm costs ``damage_health`` times the share of the ecosystem its
+    wind destroys (from the region's fragility curves), whether or not the
+    insurance pays. ``miss_health`` is the older flat penalty for a storm
+    that misses the trigger; the presets no longer use it.
+    """
+
+    trigger_score: int  # storm hit and the insurance paid out
+    miss_score: int  # storm hit but the trigger was not met
+    calm_score: int  # no storm
+    miss_health: int = 0  # health change when a storm misses the trigger
+    damage_health: int = 0  # health change for a storm that destroys everything
+
+
+GAME_MODE_RULES = ScoringRule(trigger_score=5, miss_score=-5, calm_score=2, damage_health=-10)
+V2_RULES = ScoringRule(trigger_score=5, miss_score=-5, calm_score=2, damage_health=-15)
+V3_RULES = ScoringRule(trigger_score=6, miss_score=-4, calm_score=2, damage_health=-15)
+
+
+def draw_wind_speed(size=None, rng=None):
+    """Wind speed in whole knots, uniform between ``WIND_MIN`` and ``WIND_MAX``."""
+    rng = _rng if rng is None else rng
+    if size is None:
+        return int(rng.integers(WIND_MIN, WIND_MAX + 1))
+    return rng.integers(WIND_MIN, WIND_MAX + 1, size, dtype=np.int16)
+
+
+def draw_storm(storm_chance, size=None, rng=None):
+    """Whether a storm hits, with probability ``storm_chance``."""
+    rng = _rng if rng is None else rng
+    if size is None:
+        return bool(rng.random() < storm_chance)
+    return rng.random(size, dtype=np.float32) < storm_chance
+
+
+def is_triggered(wind_speed, trigger_speed):
+    return wind_speed >= trigger_speed
+
+
+def payout_amount(payout_percent, reef_value):
+    return (payout_percent / 100) * reef_value
+
+
+def premium_amount(premium_percent, reef_value):
+    return (premium_percent / 100) * reef_value
+
+
+def score_year(storm_occurs, triggered, rules=V3_RULES, wind_speed=None,
+               fragility=DEFAULT_FRAGILITY):
+    """Return ``(score_delta, health_delta)`` for one year of the game.
+
+    ``triggered`` only counts when a storm occurs. Storm damage to the
+    ecosystem is looked up from ``fragility`` at each storm's
+    ``wind_speed``. Scalars give Python ints back; arrays give arrays of
+    the same shape.
+    """
+    storm_occurs = np.asarray(storm_occurs, dtype=bool)
+    paid = storm_occurs & np.asarray(triggered, dtype=bool)
+    missed = storm_occurs & ~paid
+    score = np.where(paid, rules.trigger_score,
+                     np.where(missed, rules.miss_score, rules.calm_score))
+    health = np.where(missed, rules.miss_health, 0) if rules.miss_health else 0
+    if rules.damage_health:
+        if wind_speed is None:
+            raise ValueError("rules with damage_health need the storms' wind_speed")
+        # One table lookup per storm; calm years cost nothing.
+        damage = fragility.health_table(rules.damage_health).take(wind_speed, mode="clip")
+        health = health + damage * storm_occurs
+    health = np.asarray(health)
+    if score.ndim == 0:
+        return int(score), int(health)
+    return score, health
@@ -0,0 +1,175 @@
+"""Append-only binary log of every simulated game year.
+
+Each "Simulate Storm Event" click becomes one fixed-width record
+(``EVENT_DTYPE``): the sliders, the draw, the deltas and the new totals.
+Script threads only put records on a queue; a background thread writes
+them in batches, at most ``FLUSH_SECONDS`` after they were logged. Each
+server process appends to its own ``<host>-<pid>.events`` file under
+``OCEAN_RISK_EVENT_LOG`` (default ``data/events``). Set that variable to
+``0`` to turn logging off.
+
+A log file is a 16-byte header followed by packed records, so reading a
+semester of sessions is one ``np.memmap`` per file:
+
+    events = read_events()              # every file in the log directory
+    events[events["region"] == 1]       # REGIONS["Belize"].id
+"""
+
+import atexit
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from ocean_risk.core import ROLES
+from ocean_risk.regions import REGIONS
+
+_setting = os.environ.get("OCEAN_RISK_EVENT_LOG", "")
+ENABLED = _setting != "0"
+DEFAULT_LOG_DIR = Path(_setting or Path(__file__).resolve().parent.parent / "data" / "events")
+FLUSH_SECONDS = 1.0
+BATCH_EVENTS = 4096
+
+MAGIC = b"ORSEVT01"
+NO_INDEX = 255
+EVENT_DTYPE = np.dtype([
+    ("time", "<f8"),            # seconds since the epoch
+    ("seed", "<u8"),            # identifies the game
+    ("script", "S24"),
+    ("year", "u1"),
+    ("region", "u1"),           # Region.id, 255 for none
+    ("role", "u1"),             # index into ROLES, 255 for none
+    ("premium_percent", "u1"),
+    ("payout_percent", "u1"),
+    ("trigger_speed", "u1"),
+    ("wind_speed", "<u2"),
+    ("storm_occurs", "?"),
+    ("triggered", "?"),
+    ("score_delta", "i1"),
+    ("health_delta", "i1"),
+    ("funds_delta", "<f4"),     # million USD
+    ("score", "<i2"),
+    ("ecosystem_health", "<i2"),
+    ("funds", "<f4"),
+])
+# Magic, then the record size so a reader can reject a mismatched layout.
+HEADER = MAGIC + np.uint64(EVENT_DTYPE.itemsize).tobytes()
+
+
+def _index(options, value):
+    return NO_INDEX if value is None else list(options).index(value)
+
+
+class EventLog:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.pending = queue.Queue()
+        self.writer = threading.Thread(target=self._write_loop, name="event-log-writer", daemon=True)
+        self.writer.start()
+
+    def log(self, script, game, year):
+        """Record ``year`` (a ``YearRecord``) just played in ``game``; returns immediately."""
+        self.pending.put((
+            time.time(), game.seed, Path(script).name.encode()[:24], len(game.history),
+            NO_INDEX if game.region is None else REGIONS[game.region].id, _index(ROLES, game.role),
+            year.premium_percent, year.payout_percent, year.trigger_speed, year.wind_speed,
+            year.storm_occurs, year.triggered, year.score_delta, year.health_delta,
+            year.payout_amount, game.score, game.ecosystem_health, game.funds,
+        ))
+
+    def flush(self):
+        """Block until everything logged so far is on disk."""
+        self.pending.join()
+
+    def _open(self):
+        """Open the log for appending, dropping any partial record a crash left at the end."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        f = open(self.path, "a+b", buffering=0)
+        try:
+            f.seek(0)
+            header = f.read(len(HEADER))
+            if not header:
+                f.write(HEADER)
+            elif header != HEADER:
+                raise ValueError(f"{self.path} is not an event log with this record layout")
+            size = os.fstat(f.fileno()).st_size
+            f.truncate(len(HEADER) + (size - len(HEADER)) // EVENT_DTYPE.itemsize * EVENT_DTYPE.itemsize)
+        except BaseException:
+            f.close()
+            raise
+        return f
+
+    def _write_loop(self):
+        f = None
+        while True:
+            batch = [self.pending.get()]
+            deadline = time.monotonic() + FLUSH_SECONDS
+            while len(batch) < BATCH_EVENTS:
+                try:
+                    batch.append(self.pending.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            try:
+                records = np.array(batch, dtype=EVENT_DTYPE).tobytes()
+                if f is None:
+                    f = self._open()
+                f.write(records)
+            except (OSError, ValueError, OverflowError):
+                logging.getLogger(__name__).exception("Dropped %d event log records", len(batch))
+                if f is not None:
+                    # Reopen next time, which trims anything half written.
+                    f.close()
+                    f = None
+            finally:
+                for _ in batch:
+                    self.pending.task_done()
+
+
+def read_log(path):
+    """Memory-map one log file as a structured array of ``EVENT_DTYPE`` records."""
+    path = Path(path)
+    with open(path, "rb") as f:
+        header = f.read(len(HEADER))
+    if header != HEADER:
+        raise ValueError(f"{path} is not an event log with this record layout")
+    # A crash can leave a partial record at the end; ignore it.
+    n_events = (path.stat().st_size - len(HEADER)) // EVENT_DTYPE.itemsize
+    if n_events == 0:
+        return np.empty(0, dtype=EVENT_DTYPE)
+    return np.memmap(path, dtype=EVENT_DTYPE, mode="r", offset=len(HEADER), shape=(n_events,))
+
+
+def read_events(log_dir=DEFAULT_LOG_DIR):
+    """Every event in ``log_dir``, oldest file first (a copy when there are several files)."""
+    logs = [read_log(path) for path in sorted(Path(log_dir).glob("*.events"))]
+    if len(logs) == 1:
+        return logs[0]
+    return np.concatenate(logs) if logs else np.empty(0, dtype=EVENT_DTYPE)
+
+
+_event_log = None
+_event_log_lock = threading.Lock()
+
+
+def get_event_log():
+    """This process's event log, or ``None`` when logging is off."""
+    global _event_log
+    if not ENABLED:
+        return None
+    with _event_log_lock:
+        if _event_log is None:
+            _event_log = EventLog(DEFAULT_LOG_DIR / f"{socket.gethostname()}-{os.getpid()}.events")
+            atexit.register(_event_log.flush)
+        return _event_log
+
+
+def log_year(script, game, year):
+    """Append one played year to this process's event log, if logging is on."""
+    event_log = get_event_log()
+    if event_log is not None:
+        event_log.log(script, game, year)
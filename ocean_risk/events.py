@@ -0,0 +1,60 @@
+"""Sorted event sets for fast trigger-threshold queries.
+
+For a step payout (pay when the wind reaches the trigger) everything about
+a threshold follows from how many simulated storms reach it. An
+``EventSet`` keeps the distinct storm wind speeds in sorted order next to
+a suffix count of storms at or above each one, so any threshold -- or an
+array of thousands of them -- is answered with a binary search instead of
+a fresh simulation.
+"""
+
+import numpy as np
+
+from ocean_risk.core import RISK_CHANCES, draw_storm, draw_wind_speed
+from ocean_risk.pricing import DEFAULT_YEARS
+from ocean_risk.regions import REGIONS
+
+
+class EventSet:
+    def __init__(self, wind_speeds, n_years):
+        """``wind_speeds`` holds one entry per storm over ``n_years`` simulated years."""
+        self.speeds, counts = np.unique(np.asarray(wind_speeds), return_counts=True)
+        # at_or_above[i] counts storms with speed >= speeds[i]; the extra
+        # trailing zero answers thresholds above the strongest storm.
+        self.at_or_above = np.append(np.cumsum(counts[::-1])[::-1], 0)
+        self.n_years = n_years
+
+    @classmethod
+    def simulate(cls, storm_chance, n_years=DEFAULT_YEARS, rng=None, wind=None):
+        """Simulate ``n_years``; ``wind`` is a region's ``WindTable`` (default: uniform)."""
+        storm_happens = draw_storm(storm_chance, n_years, rng)
+        wind_speed = draw_wind_speed(n_years, rng) if wind is None else wind.sample(n_years, rng)
+        return cls(wind_speed[storm_happens], n_years)
+
+    @property
+    def n_events(self):
+        return int(self.at_or_above[0])
+
+    def count_at_or_above(self, threshold):
+        """Number of storms with wind speed >= ``threshold`` (scalar or array)."""
+        return self.at_or_above[np.searchsorted(self.speeds, threshold, side="left")]
+
+    def trigger_probability(self, threshold):
+        """Chance per year that a storm reaches ``threshold``."""
+        return self.count_at_or_above(threshold) / self.n_years
+
+    def expected_payout(self, threshold, payout):
+        """Expected annual payout of a step policy paying ``payout`` at ``threshold``."""
+        return self.trigger_probability(threshold) * payout
+
+
+def build_event_sets(n_years=DEFAULT_YEARS, rng=None):
+    """One event set per risk level and per game region."""
+    # Imported here so that importing the package does not load the track
+    # cache module, which also runs as ``python -m ocean_risk.tracks``.
+    from ocean_risk.tracks import region_wind
+
+    sets = {name: EventSet.simulate(chance, n_years, rng) for name, chance in RISK_CHANCES.items()}
+    sets.update((name, EventSet.simulate(region.storm_chance, n_years, rng, region_wind(name)))
+                for name, region in REGIONS.items())
+    return sets
@@ -0,0 +1,181 @@
+"""Opt-in timing of each section of a Streamlit rerun.
+
+Set ``OCEAN_RISK_METRICS=1`` to enable. Each app creates a timer at the
+top of the script and marks where each logical section starts:
+
+    timer = rerun_timer(__file__)
+    timer.section("styling")
+    ...
+    timer.finish()
+
+Marking a section closes the previous one. Durations go into fixed-bucket
+histograms, both globally per (script, section) and per session, and a
+Prometheus text endpoint serves them on ``OCEAN_RISK_METRICS_PORT``
+(default 9464) at ``/metrics``. When disabled, the timer does nothing.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ENABLED = os.environ.get("OCEAN_RISK_METRICS", "") not in ("", "0")
+PORT = int(os.environ.get("OCEAN_RISK_METRICS_PORT", "9464"))
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+MAX_SESSIONS = 1000
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                break
+        else:
+            i = len(BUCKETS)
+        self.counts[i] += 1
+        self.total += seconds
+        self.count += 1
+
+    def exposition(self, name, labels):
+        lines, cumulative = [], 0
+        for bound, n in zip((*BUCKETS, "+Inf"), self.counts):
+            cumulative += n
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {self.total}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self, max_sessions=MAX_SESSIONS):
+        self.lock = threading.Lock()
+        self.sections = {}  # (script, section) -> Histogram
+        self.sessions = OrderedDict()  # session -> {(script, section): Histogram}
+        self.max_sessions = max_sessions
+
+    def record(self, session, script, durations):
+        """Add one rerun's ``{section: seconds}``; the total is recorded as section "rerun"."""
+        durations = {**durations, "rerun": sum(durations.values())}
+        with self.lock:
+            per_session = self.sessions.pop(session, None) or {}
+            self.sessions[session] = per_session
+            if len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+            for section, seconds in durations.items():
+                key = (script, section)
+                self.sections.setdefault(key, Histogram()).observe(seconds)
+                per_session.setdefault(key, Histogram()).observe(seconds)
+
+    def prometheus_text(self):
+        lines = [
+            "# HELP ocean_risk_section_seconds Time spent in each app section per rerun.",
+            "# TYPE ocean_risk_section_seconds histogram",
+        ]
+        with self.lock:
+            for (script, section), histogram in sorted(self.sections.items()):
+                lines += histogram.exposition("ocean_risk_section_seconds",
+                                              f'script="{script}",section="{section}"')
+            lines += [
+                "# HELP ocean_risk_session_rerun_seconds Whole-rerun time per session.",
+                "# TYPE ocean_risk_session_rerun_seconds histogram",
+            ]
+            for session, histograms in self.sessions.items():
+                for (script, section), histogram in sorted(histograms.items()):
+                    if section == "rerun":
+                        lines += histogram.exposition("ocean_risk_session_rerun_seconds",
+                                                      f'script="{script}",session="{session}"')
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+class RerunTimer:
+    def __init__(self, script, session, registry=REGISTRY):
+        self.script = script
+        self.session = session
+        self.registry = registry
+        self.durations = {}
+        self.current = None
+        self.started = time.perf_counter()
+
+    def section(self, name):
+        now = time.perf_counter()
+        if self.current is not None:
+            self.durations[self.current] = self.durations.get(self.current, 0.0) + now - self.started
+        self.current, self.started = name, now
+
+    def finish(self):
+        """Close the last section and record the rerun; call before ``st.stop()``."""
+        self.section(None)
+        self.registry.record(self.session, self.script, self.durations)
+        self.durations = {}
+
+
+class _NullTimer:
+    def section(self, name):
+        pass
+
+    def finish(self):
+        pass
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.prometheus_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=PORT):
+    """Serve ``/metrics`` on localhost from a daemon thread, once per process."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer(("127.0.0.1", port), _MetricsHandler)
+            except OSError:
+                # Port taken, e.g. by another app process; keep timing anyway.
+                _server = False
+            else:
+                threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return _server or None
+
+
+def _streamlit_session_id():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return "unknown"
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "unknown"
+
+
+def rerun_timer(script, session=None):
+    """Timer for one rerun of ``script``; a no-op unless metrics are enabled."""
+    if not ENABLED:
+        return _NullTimer()
+    start_metrics_server()
+    return RerunTimer(Path(script).name, session or _streamlit_session_id())
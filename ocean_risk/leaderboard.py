@@ -0,0 +1,213 @@
+"""Classroom leaderboard in a shared SQLite database.
+
+Finished games are queued with ``submit`` and written by one background
+thread, which drains everything queued so far in a single transaction.
+A burst of submissions at the end of a workshop therefore costs a
+Streamlit script thread one ``Queue.put``, never a lock wait. The
+database runs in WAL mode, so the leaderboard page keeps reading while
+the writer commits; connections come from a small pool shared by both.
+
+The database lives at ``OCEAN_RISK_LEADERBOARD`` or
+``data/leaderboard.sqlite3``.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from ocean_risk.state import GameState
+
+DEFAULT_DB_PATH = Path(os.environ.get(
+    "OCEAN_RISK_LEADERBOARD", Path(__file__).resolve().parent.parent / "data" / "leaderboard.sqlite3"))
+POOL_SIZE = 4
+BUSY_TIMEOUT_MS = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id               INTEGER PRIMARY KEY,
+    finished_at      REAL    NOT NULL,
+    region           TEXT    NOT NULL,
+    role             TEXT    NOT NULL,
+    score            INTEGER NOT NULL,
+    ecosystem_health INTEGER NOT NULL,
+    funds            REAL    NOT NULL,
+    seed             INTEGER NOT NULL,
+    state            BLOB    NOT NULL
+);
+CREATE TABLE IF NOT EXISTS years (
+    game_id          INTEGER NOT NULL REFERENCES games(id),
+    year             INTEGER NOT NULL,
+    premium_percent  INTEGER NOT NULL,
+    payout_percent   INTEGER NOT NULL,
+    trigger_speed    INTEGER NOT NULL,
+    wind_speed       INTEGER NOT NULL,
+    storm_occurs     INTEGER NOT NULL,
+    triggered        INTEGER NOT NULL,
+    payout_amount    REAL    NOT NULL,
+    PRIMARY KEY (game_id, year)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS games_by_score ON games (score DESC, ecosystem_health DESC);
+CREATE INDEX IF NOT EXISTS games_by_region ON games (region, score DESC);
+CREATE INDEX IF NOT EXISTS games_by_role ON games (role, score DESC);
+"""
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False,
+                           isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    return conn
+
+
+class ConnectionPool:
+    """A fixed number of connections handed out one thread at a time."""
+
+    def __init__(self, path=DEFAULT_DB_PATH, size=POOL_SIZE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.idle = queue.LifoQueue()
+        for _ in range(size):
+            self.idle.put(_connect(self.path))
+        with self.connection() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def connection(self):
+        conn = self.idle.get()
+        try:
+            yield conn
+        finally:
+            self.idle.put(conn)
+
+    def close(self):
+        while not self.idle.empty():
+            self.idle.get_nowait().close()
+
+
+class Leaderboard:
+    def __init__(self, path=DEFAULT_DB_PATH, pool_size=POOL_SIZE):
+        self.pool = ConnectionPool(path, pool_size)
+        self.pending = queue.Queue()
+        self.writer = threading.Thread(target=self._write_loop, name="leaderboard-writer", daemon=True)
+        self.writer.start()
+
+    def submit(self, game):
+        """Queue a finished ``GameState``; returns immediately."""
+        self.pending.put((time.time(), game.to_bytes()))
+
+    def flush(self):
+        """Block until everything submitted so far is committed."""
+        self.pending.join()
+
+    def close(self):
+        self.pending.put(None)
+        self.writer.join()
+        self.pool.close()
+
+    def _write_loop(self):
+        while True:
+            batch = [self.pending.get()]
+            while True:
+                try:
+                    batch.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+            games = [item for item in batch if item is not None]
+            try:
+                if games:
+                    self._write(games)
+            except Exception:
+                # Keep the writer alive: a dead writer never calls task_done and flush() would hang.
+                logging.getLogger(__name__).exception("Dropped %d leaderboard entries", len(games))
+            finally:
+                for _ in batch:
+                    self.pending.task_done()
+            if len(games) < len(batch):
+                return
+
+    def _write(self, games):
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for finished_at, blob in games:
+                    game = GameState.from_bytes(blob)
+                    game_id = conn.execute(
+                        "INSERT INTO games (finished_at, region, role, score,"
+                        " ecosystem_health, funds, seed, state) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (finished_at, game.region or "", game.role or "", game.score,
+                         game.ecosystem_health, game.funds, game.seed, blob),
+                    ).lastrowid
+                    conn.executemany(
+                        "INSERT INTO years VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [(game_id, year, r.premium_percent, r.payout_percent, r.trigger_speed,
+                          r.wind_speed, r.storm_occurs, r.triggered, r.payout_amount)
+                         for year, r in enumerate(game.history, start=1)],
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _query(self, sql, params=()):
+        with self.pool.connection() as conn:
+            cursor = conn.execute(sql, params)
+            columns = [d[0] for d in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor]
+
+    def games(self):
+        """Every submitted game as a ``GameState``, oldest first."""
+        with self.pool.connection() as conn:
+            rows = conn.execute("SELECT state FROM games ORDER BY id").fetchall()
+        return [GameState.from_bytes(blob) for (blob,) in rows]
+
+    def top_games(self, limit=20, region=None, role=None):
+        """Best games by score, then ecosystem health, optionally for one region or role."""
+        where, params = [], []
+        if region is not None:
+            where.append("region = ?")
+            params.append(region)
+        if role is not None:
+            where.append("role = ?")
+            params.append(role)
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+        return self._query(
+            "SELECT region, role, score, ecosystem_health, funds, finished_at FROM games "
+            f"{clause} ORDER BY score DESC, ecosystem_health DESC LIMIT ?", (*params, limit))
+
+    def summary(self, by="region"):
+        """Games played and average outcome per region or per role."""
+        if by not in ("region", "role"):
+            raise ValueError(f"cannot group by {by!r}")
+        return self._query(
+            f"SELECT {by}, COUNT(*) AS games, AVG(score) AS avg_score, MAX(score) AS best_score,"
+            f" AVG(ecosystem_health) AS avg_health, AVG(funds) AS avg_funds"
+            f" FROM games GROUP BY {by} ORDER BY avg_score DESC")
+
+    def decision_summary(self):
+        """Average premium, payout and trigger chosen per region, over every year played."""
+        return self._query(
+            "SELECT g.region, AVG(y.premium_percent) AS avg_premium, AVG(y.payout_percent) AS avg_payout,"
+            " AVG(y.trigger_speed) AS avg_trigger, AVG(y.triggered) AS trigger_rate"
+            " FROM years y JOIN games g ON g.id = y.game_id GROUP BY g.region ORDER BY g.region")
+
+
+_leaderboards = {}
+_leaderboards_lock = threading.Lock()
+
+
+def get_leaderboard(path=DEFAULT_DB_PATH):
+    """The process-wide leaderboard for ``path``, started on first use."""
+    path = Path(path)
+    with _leaderboards_lock:
+        if path not in _leaderboards:
+            _leaderboards[path] = Leaderboard(path)
+            atexit.register(_leaderboards[path].flush)
+        return _leaderboards[path]
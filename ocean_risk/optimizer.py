@@ -0,0 +1,197 @@
+"""Strategy search for the multi-year game.
+
+Candidates are adaptive policies: a "calm" strategy played while the
+ecosystem is healthy and funds are comfortable, and a "stressed" strategy
+played while ecosystem health or the payouts received so far are below a
+threshold, or from a given year of the game on. Static strategies are the
+special case where both halves match.
+
+Candidates are split across a ``ProcessPoolExecutor``. Each worker rebuilds
+the same storm draws from the search seed (common random numbers, so
+candidates are compared on identical weather) and scores its share of
+candidates with vectorized path simulation. Workers share nothing, so the
+search scales with the number of cores.
+
+Run ``python -m ocean_risk.optimizer`` for the best policy per region and
+role.
+"""
+
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from ocean_risk.core import (
+    GAME_YEARS,
+    START_HEALTH,
+    START_SCORE,
+    V3_RULES,
+    draw_storm,
+    is_triggered,
+    payout_amount,
+    premium_amount,
+    score_year,
+)
+from ocean_risk.playthrough import Strategy
+from ocean_risk.regions import REGIONS
+from ocean_risk.rng import OPTIMIZER, stream
+from ocean_risk.tracks import region_wind
+
+# What each role values on top of the resilience score: weight on final
+# ecosystem health and on net funds (payouts minus premiums, in % of reef
+# value). The game's scoring does not depend on the role, so these weights
+# are what makes the optimum differ between roles.
+ROLE_OBJECTIVES = {
+    "Minister of Coastal Resilience": {"health": 0.0, "net_funds": 0.0},
+    "Insurance Advisor": {"health": 0.0, "net_funds": 0.1},
+    "Marine NGO Officer": {"health": 0.25, "net_funds": 0.0},
+}
+
+
+@dataclass(frozen=True)
+class AdaptivePolicy:
+    calm: Strategy
+    stressed: Strategy
+    health_threshold: int = 0  # play ``stressed`` while health is below this
+    funds_threshold: int = 0  # ... or while payouts received are below this % of reef value
+    from_year: int | None = None  # ... or from this year of the game (1-based) on
+
+    def is_stressed(self, year, health, funds, reef_value):
+        """Where ``stressed`` is played in 0-based ``year``, per path."""
+        stressed = (health < self.health_threshold) | (funds < self.funds_threshold / 100 * reef_value)
+        if self.from_year is not None:
+            stressed |= year + 1 >= self.from_year
+        return stressed
+
+
+@dataclass(frozen=True)
+class PolicyEvaluation:
+    policy: AdaptivePolicy
+    mean_score: float
+    mean_health: float
+    mean_net_funds: float  # million USD
+
+    def objective(self, role, reef_value):
+        weights = ROLE_OBJECTIVES[role]
+        return (self.mean_score
+                + weights["health"] * self.mean_health
+                + weights["net_funds"] * 100 * self.mean_net_funds / reef_value)
+
+
+def candidate_policies(triggers=range(80, 161, 10), payouts=(20, 60, 100),
+                       premiums=(1, 15), health_thresholds=(0, 70, 85),
+                       funds_thresholds=(0, 20, 60), from_years=range(2, GAME_YEARS + 1)):
+    """Static strategies plus every calm/stressed trigger pairing.
+
+    Each pairing is tried with every health and funds threshold (0 never
+    applies: health and payouts received cannot go below it), and on its
+    own with every year to switch to the stressed strategy. Playing the
+    stressed strategy from the start is one of the static strategies.
+    """
+    policies = [AdaptivePolicy(calm=s, stressed=s)
+                for s in itertools.starmap(Strategy, itertools.product(premiums, payouts, triggers))]
+    for premium, payout, calm_trigger, stressed_trigger in itertools.product(
+            premiums, payouts, triggers, triggers):
+        if calm_trigger == stressed_trigger:
+            continue
+        calm = Strategy(premium, payout, calm_trigger)
+        stressed = Strategy(premium, payout, stressed_trigger)
+        for health, funds in itertools.product(health_thresholds, funds_thresholds):
+            if health or funds:
+                policies.append(AdaptivePolicy(calm, stressed, health_threshold=health, funds_threshold=funds))
+        for year in from_years:
+            policies.append(AdaptivePolicy(calm, stressed, from_year=year))
+    return policies
+
+
+def evaluate_policies(region, policies, n_paths, seed, rules=V3_RULES, years=GAME_YEARS):
+    """Play every policy on the same ``n_paths`` storm histories."""
+    preset = REGIONS[region]
+    rng = stream(seed, OPTIMIZER, REGIONS[region].id)
+    wind_speed = region_wind(region).sample((years, n_paths), rng)
+    storm_occurs = draw_storm(preset.storm_chance, (years, n_paths), rng)
+
+    evaluations = []
+    for policy in policies:
+        score = np.full(n_paths, START_SCORE)
+        health = np.full(n_paths, START_HEALTH)
+        funds = np.zeros(n_paths)
+        premiums = np.zeros(n_paths)
+        for year in range(years):
+            stressed = policy.is_stressed(year, health, funds, preset.reef_value)
+            trigger = np.where(stressed, policy.stressed.trigger_speed, policy.calm.trigger_speed)
+            payout = np.where(stressed, policy.stressed.payout_percent, policy.calm.payout_percent)
+            premium = np.where(stressed, policy.stressed.premium_percent, policy.calm.premium_percent)
+
+            triggered = storm_occurs[year] & is_triggered(wind_speed[year], trigger)
+            score_delta, health_delta = score_year(storm_occurs[year], triggered, rules, wind_speed[year],
+                                                   preset.fragility)
+            score += score_delta
+            health += health_delta
+            funds += np.where(triggered, payout_amount(payout, preset.reef_value), 0.0)
+            premiums += premium_amount(premium, preset.reef_value)
+        evaluations.append(PolicyEvaluation(
+            policy=policy,
+            mean_score=float(score.mean()),
+            mean_health=float(health.mean()),
+            mean_net_funds=float((funds - premiums).mean()),
+        ))
+    return evaluations
+
+
+def optimize(regions=tuple(REGIONS), policies=None, n_paths=20_000, seed=0, max_workers=None):
+    """Return ``{(region, role): best PolicyEvaluation}``."""
+    policies = candidate_policies() if policies is None else policies
+    max_workers = max_workers or os.cpu_count() or 1
+    chunk = -(-len(policies) // max_workers)
+    chunks = [policies[i:i + chunk] for i in range(0, len(policies), chunk)]
+
+    best = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {region: [pool.submit(evaluate_policies, region, part, n_paths, seed)
+                            for part in chunks]
+                   for region in regions}
+        for region, region_futures in futures.items():
+            evaluations = [e for future in region_futures for e in future.result()]
+            reef_value = REGIONS[region].reef_value
+            for role in ROLE_OBJECTIVES:
+                best[region, role] = max(evaluations, key=lambda e: e.objective(role, reef_value))
+    return best
+
+
+def _describe(strategy):
+    return (f"premium {strategy.premium_percent}%, payout {strategy.payout_percent}%, "
+            f"trigger {strategy.trigger_speed} kn")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    results = optimize(n_paths=args.paths, seed=args.seed, max_workers=args.workers)
+    for (region, role), evaluation in results.items():
+        policy = evaluation.policy
+        print(f"{region} / {role}: mean score {evaluation.mean_score:.1f}, "
+              f"health {evaluation.mean_health:.1f}, net funds ${evaluation.mean_net_funds:.0f}M")
+        if policy.calm == policy.stressed:
+            print(f"  every year: {_describe(policy.calm)}")
+        else:
+            conditions = []
+            if policy.health_threshold:
+                conditions.append(f"health >= {policy.health_threshold}")
+            if policy.funds_threshold:
+                conditions.append(f"payouts received >= {policy.funds_threshold}% of reef value")
+            if policy.from_year is not None:
+                conditions.append(f"before year {policy.from_year}")
+            print(f"  while {' and '.join(conditions)}: {_describe(policy.calm)}")
+            print(f"  otherwise: {_describe(policy.stressed)}")
+
+
+if __name__ == "__main__":
+    main()
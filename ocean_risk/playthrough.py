@@ -0,0 +1,140 @@
+"""Batch playthroughs of the 5-year game for score calibration.
+
+Every path is one complete game: each year draws a wind speed and a storm
+for the region, applies the player's strategy and updates score, health
+and funds with the same rules as ``game_mode_v3_final.py``. Paths run in
+chunks of ``(years, paths)`` arrays, so millions of games take seconds.
+Each chunk has its own random stream, so a seed reproduces a run exactly.
+
+Run ``python -m ocean_risk.playthrough`` for a score report per region and
+strategy.
+"""
+
+import argparse
+from dataclasses import dataclass
+
+import numpy as np
+
+from ocean_risk.core import (
+    GAME_YEARS,
+    START_HEALTH,
+    START_SCORE,
+    V3_RULES,
+    draw_storm,
+    is_triggered,
+    payout_amount,
+    score_year,
+)
+from ocean_risk.regions import REGIONS
+from ocean_risk.rng import PLAYTHROUGH, new_seed, stream
+from ocean_risk.tracks import region_wind
+
+CHUNK_PATHS = 1_000_000
+
+
+@dataclass(frozen=True)
+class Strategy:
+    """One year's slider settings; defaults match the game's sliders."""
+
+    premium_percent: int = 5
+    payout_percent: int = 60
+    trigger_speed: int = 110
+
+
+STRATEGIES = {
+    "Default sliders": Strategy(),
+    "Low trigger": Strategy(trigger_speed=80),
+    "High trigger": Strategy(trigger_speed=160),
+    "Full cover, low trigger": Strategy(premium_percent=15, payout_percent=100, trigger_speed=80),
+}
+
+
+@dataclass(frozen=True)
+class PlaythroughResults:
+    """Final values of each simulated game, one entry per path."""
+
+    score: np.ndarray
+    ecosystem_health: np.ndarray
+    funds: np.ndarray  # million USD received in payouts
+
+    def share_at_least(self, score):
+        return float(np.mean(self.score >= score))
+
+
+def _per_year(strategy, field, years):
+    if isinstance(strategy, Strategy):
+        strategy = [strategy] * years
+    if len(strategy) != years:
+        raise ValueError(f"expected {years} yearly strategies, got {len(strategy)}")
+    return np.array([getattr(s, field) for s in strategy])[:, None]
+
+
+def simulate_playthroughs(region, strategy, n_paths, rules=V3_RULES, years=GAME_YEARS,
+                          seed=None, chunk_paths=CHUNK_PATHS):
+    """Play ``n_paths`` complete games in ``region``.
+
+    ``strategy`` is a single ``Strategy`` used every year or a list with one
+    per year.
+    """
+    seed = new_seed() if seed is None else seed
+    preset = REGIONS[region]
+    triggers = _per_year(strategy, "trigger_speed", years)
+    payouts = payout_amount(_per_year(strategy, "payout_percent", years), preset.reef_value)
+
+    score = np.empty(n_paths, dtype=np.int32)
+    health = np.empty(n_paths, dtype=np.int32)
+    funds = np.empty(n_paths)
+    for chunk, start in enumerate(range(0, n_paths, chunk_paths)):
+        stop = min(start + chunk_paths, n_paths)
+        shape = (years, stop - start)
+        rng = stream(seed, PLAYTHROUGH, chunk)
+        wind_speed = region_wind(region).sample(shape, rng)
+        storm_occurs = draw_storm(preset.storm_chance, shape, rng)
+        triggered = storm_occurs & is_triggered(wind_speed, triggers)
+        score_delta, health_delta = score_year(storm_occurs, triggered, rules, wind_speed,
+                                               preset.fragility)
+
+        score[start:stop] = START_SCORE + score_delta.sum(axis=0)
+        health[start:stop] = START_HEALTH + health_delta.sum(axis=0)
+        funds[start:stop] = np.where(triggered, payouts, 0.0).sum(axis=0)
+    return PlaythroughResults(score=score, ecosystem_health=health, funds=funds)
+
+
+def histogram(values):
+    """Return ``(distinct values, share of paths)`` for integer results."""
+    distinct, counts = np.unique(values, return_counts=True)
+    return distinct, counts / len(values)
+
+
+def _print_histogram(label, values):
+    print(f"  {label}:")
+    for value, share in zip(*histogram(values)):
+        print(f"    {value:>4}  {share:7.2%}  {'#' * round(share * 100)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--histograms", action="store_true",
+                        help="print full score and health histograms")
+    args = parser.parse_args(argv)
+
+    seed = new_seed() if args.seed is None else args.seed
+    print(f"seed {seed}")
+    for region in REGIONS:
+        for name, strategy in STRATEGIES.items():
+            results = simulate_playthroughs(region, strategy, args.paths, seed=seed)
+            p20, p50, p80 = np.percentile(results.score, [20, 50, 80])
+            print(f"{region} / {name}: mean score {results.score.mean():.1f}, "
+                  f"score >= 80: {results.share_at_least(80):.1%}, "
+                  f">= 50: {results.share_at_least(50):.1%}, "
+                  f"20th/50th/80th percentile {p20:.0f}/{p50:.0f}/{p80:.0f}, "
+                  f"mean health {results.ecosystem_health.mean():.1f}")
+            if args.histograms:
+                _print_histogram("score", results.score)
+                _print_histogram("ecosystem health", results.ecosystem_health)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Monte Carlo pricing for the single-reef parametric policy.
+
+Uses the same storm model as the "Run Simulation" button: a storm arrives
+with the probability of the chosen risk level, its wind speed is a whole
+number of knots between 70 and 180, and the policy pays a fixed share of
+the ecosystem value when the wind reaches the trigger. Instead of one draw
+per click, every storm-year is drawn in a single batched NumPy call.
+
+``simulate_policy_adaptive`` instead draws chunks until the standard error
+of the expected payout falls below a tolerance, optionally with antithetic
+pairs of storm-years or with importance sampling that draws half of the
+winds from the tail at or above the trigger and reweights them.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from ocean_risk.core import (
+    RISK_CHANCES,
+    WIND_MAX,
+    WIND_MIN,
+    draw_storm,
+    draw_wind_speed,
+    is_triggered,
+    payout_amount,
+    premium_amount,
+)
+
+DEFAULT_YEARS = 1_000_000
+CHUNK_YEARS = 100_000
+MAX_YEARS = 20_000_000
+SAMPLERS = ("plain", "antithetic", "importance")
+MIN_YEARS = 10_000  # an adaptive run never stops before this many storm-years ...
+MIN_PAYOUTS = 10  # ... or before this many of its samples have paid out
+TAIL_SHARE = 0.5  # share of importance-sampled winds drawn at or above the trigger
+
+
+@dataclass(frozen=True)
+class PolicyStats:
+    """Long-run averages of one policy design, per year of cover."""
+
+    expected_payout: float  # million USD
+    trigger_probability: float
+    premium: float  # million USD
+    loss_ratio: float  # expected payout / premium
+    n_years: int
+    std_error: float  # of the expected payout, million USD
+    converged: bool  # False when an adaptive run stopped at its year limit first
+
+
+def simulate_policy(reef_value, storm_risk, premium_percent, payout_percent,
+                    trigger_speed, n_years=DEFAULT_YEARS, rng=None):
+    """Simulate ``n_years`` storm-years and summarise the policy's payouts.
+
+    Arguments mirror the sliders in ``main.py``: values in million USD and
+    percentages as whole numbers. ``rng`` is a ``numpy.random.Generator``;
+    the shared module generator is used when omitted.
+    """
+    storm_happens = draw_storm(RISK_CHANCES[storm_risk], n_years, rng)
+    wind_speed = draw_wind_speed(n_years, rng)
+    triggered = storm_happens & is_triggered(wind_speed, trigger_speed)
+    n_triggered = int(np.count_nonzero(triggered))
+
+    trigger_probability = n_triggered / n_years
+    return _policy_stats(reef_value, premium_percent, payout_percent, trigger_probability,
+                         float(np.sqrt(trigger_probability * (1 - trigger_probability) / n_years)), n_years)
+
+
+def _policy_stats(reef_value, premium_percent, payout_percent, trigger_probability, std_error, n_years,
+                  converged=True):
+    payout = payout_amount(payout_percent, reef_value)
+    expected_payout = trigger_probability * payout
+    premium = premium_amount(premium_percent, reef_value)
+    return PolicyStats(
+        expected_payout=expected_payout,
+        trigger_probability=trigger_probability,
+        premium=premium,
+        loss_ratio=expected_payout / premium if premium else float("nan"),
+        n_years=n_years,
+        std_error=std_error * payout,
+        converged=converged,
+    )
+
+
+def _trigger_samples(sampler, storm_chance, trigger_speed, n_years, rng):
+    """Independent samples whose mean estimates the chance of a payout, and the storm-years drawn."""
+    span = WIND_MAX - WIND_MIN + 1
+    if sampler == "antithetic":
+        # Each pair mirrors its uniforms, u and 1 - u; the payout is monotone
+        # in both, so the two halves are negatively correlated.
+        pairs = n_years // 2
+        storm_u, wind_u = rng.random((2, pairs))
+        storm_u, wind_u = np.stack([storm_u, 1 - storm_u]), np.stack([wind_u, 1 - wind_u])
+        wind_speed = WIND_MIN + np.minimum(wind_u * span, span - 1).astype(np.int16)
+        paid = (storm_u < storm_chance) & is_triggered(wind_speed, trigger_speed)
+        return paid.mean(axis=0), 2 * pairs
+    if sampler == "importance":
+        # Every proposal year has a storm, and at least TAIL_SHARE of its winds
+        # reach the trigger; each year is weighted by the likelihood ratio of
+        # the true model to the proposal.
+        n_tail = WIND_MAX + 1 - np.clip(trigger_speed, WIND_MIN, WIND_MAX + 1)
+        if not n_tail:
+            return np.zeros(n_years), n_years
+        tail_share = max(TAIL_SHARE, n_tail / span)
+        tail = rng.random(n_years) < tail_share
+        wind_speed = rng.integers(WIND_MAX + 1 - n_tail, WIND_MAX + 1, n_years)
+        if n_tail < span:
+            wind_speed = np.where(tail, wind_speed, rng.integers(WIND_MIN, WIND_MAX + 1 - n_tail, n_years))
+        weight = storm_chance * (n_tail / span) / tail_share
+        return is_triggered(wind_speed, trigger_speed) * weight, n_years
+    paid = draw_storm(storm_chance, n_years, rng) & is_triggered(draw_wind_speed(n_years, rng), trigger_speed)
+    return paid, n_years
+
+
+def simulate_policy_adaptive(reef_value, storm_risk, premium_percent, payout_percent, trigger_speed,
+                             tolerance=0.005, sampler="importance", chunk_years=CHUNK_YEARS,
+                             max_years=MAX_YEARS, rng=None):
+    """Like ``simulate_policy``, but simulate until the estimate is precise enough.
+
+    Chunks of ``chunk_years`` storm-years are drawn until the standard
+    error of the expected payout is at most ``tolerance`` times the
+    estimate, or ``max_years`` have been drawn; ``converged`` on the result
+    tells the two apart. A run needs at least ``MIN_YEARS`` storm-years and
+    ``MIN_PAYOUTS`` paying samples before it can converge, so a rare payout
+    that has not shown up yet does not pass for a zero price. ``sampler``
+    is one of ``SAMPLERS``.
+    """
+    if sampler not in SAMPLERS:
+        raise ValueError(f"unknown sampler {sampler!r}; expected one of {SAMPLERS}")
+    rng = np.random.default_rng() if rng is None else rng
+    storm_chance = RISK_CHANCES[storm_risk]
+    if trigger_speed > WIND_MAX:
+        # No storm reaches the trigger: the price is exactly zero.
+        return _policy_stats(reef_value, premium_percent, payout_percent, 0.0, 0.0, 0, True)
+    n_samples = n_years = n_payouts = 0
+    total = total_sq = 0.0
+    converged = False
+    while not converged and n_years < max_years:
+        samples, drawn = _trigger_samples(sampler, storm_chance, trigger_speed, chunk_years, rng)
+        n_samples += len(samples)
+        n_years += drawn
+        n_payouts += int(np.count_nonzero(samples))
+        total += float(samples.sum())
+        total_sq += float(np.square(samples, dtype=np.float64).sum())
+        mean = total / n_samples
+        std_error = float(np.sqrt(max(total_sq / n_samples - mean**2, 0) / n_samples))
+        converged = (n_years >= MIN_YEARS and n_payouts >= MIN_PAYOUTS
+                     and std_error <= tolerance * mean)
+    return _policy_stats(reef_value, premium_percent, payout_percent, mean, std_error, n_years, converged)
@@ -0,0 +1,156 @@
+"""Region catalog, compiled into sampling tables once per process.
+
+Regions are read from ``regions.toml`` next to this file, or from the path
+in ``OCEAN_RISK_REGIONS``. Each region's wind-speed distribution, however
+it is specified, is compiled into a discrete distribution over whole knots
+with an alias table (Vose's method), so a draw costs one integer and at
+most one uniform whatever the distribution's shape. The ecosystem's
+fragility curves (``ocean_risk.fragility``) are compiled into a per-knot
+lookup table the same way; they are the one damage model, used both for
+the game's health loss and for the damage behind basis risk, tail losses
+and the climate outlook.
+
+A uniform wind distribution draws exactly like ``draw_wind_speed``, so
+seeded games and batch runs reproduce their earlier results.
+"""
+
+import math
+import os
+import tomllib
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from ocean_risk.fragility import DEFAULT_FRAGILITY, EcosystemFragility
+
+CATALOG_PATH = Path(os.environ.get("OCEAN_RISK_REGIONS", Path(__file__).resolve().parent / "regions.toml"))
+
+_rng = np.random.default_rng()
+
+
+def _alias_table(pmf):
+    """Vose's alias table: ``(prob, alias)`` with ``len(pmf)`` entries each."""
+    n = len(pmf)
+    scaled = np.asarray(pmf, dtype=np.float64) * n
+    prob = np.ones(n)
+    alias = np.arange(n)
+    small = [i for i in range(n) if scaled[i] < 1.0]
+    large = [i for i in range(n) if scaled[i] >= 1.0]
+    while small and large:
+        s, g = small.pop(), large.pop()
+        prob[s], alias[s] = scaled[s], g
+        scaled[g] -= 1.0 - scaled[s]
+        (small if scaled[g] < 1.0 else large).append(g)
+    # Whatever is left is 1 up to rounding error.
+    return prob, alias
+
+
+class WindTable:
+    """Distribution over whole-knot wind speeds with O(1) sampling."""
+
+    def __init__(self, values, weights):
+        self.values = np.asarray(values, dtype=np.int16)
+        weights = np.asarray(weights, dtype=np.float64)
+        if self.values.shape != weights.shape or not len(weights) or (weights < 0).any():
+            raise ValueError("wind table needs one non-negative weight per value")
+        self.pmf = weights / weights.sum()
+        self.uniform = bool(np.all(self.pmf == self.pmf[0]))
+        self.prob, self.alias = _alias_table(self.pmf)
+
+    def sample(self, size=None, rng=None):
+        """Wind speeds in knots: an ``int`` for ``size=None``, else an ``int16`` array."""
+        rng = _rng if rng is None else rng
+        # Same integer draw as draw_wind_speed, so uniform tables reproduce it.
+        if size is None:
+            index = rng.integers(0, len(self.values))
+        else:
+            index = rng.integers(0, len(self.values), size, dtype=np.int16)
+        if not self.uniform:
+            keep = rng.random(size) < self.prob[index]
+            index = np.where(keep, index, self.alias[index])
+        if size is None:
+            return int(self.values[index])
+        return self.values[index]
+
+    def mean(self):
+        return float(self.pmf @ self.values)
+
+    def survival(self, threshold):
+        """Chance that a storm's wind speed is at least ``threshold``."""
+        return float(self.pmf[self.values >= threshold].sum())
+
+
+def _knots(spec):
+    return np.arange(int(spec["min"]), int(spec["max"]) + 1)
+
+
+def compile_wind(spec):
+    """Build a ``WindTable`` from a catalog ``wind`` entry."""
+    kind = spec["distribution"]
+    if kind == "uniform":
+        values = _knots(spec)
+        return WindTable(values, np.ones(len(values)))
+    if kind == "weibull":
+        # Probability of each whole knot: the CDF over [v - 0.5, v + 0.5).
+        values = _knots(spec)
+        edges = np.append(values - 0.5, values[-1] + 0.5)
+        cdf = 1 - np.exp(-(np.clip(edges, 0, None) / spec["scale"]) ** spec["shape"])
+        return WindTable(values, np.diff(cdf))
+    if kind == "table":
+        return WindTable(spec["values"], spec["weights"])
+    raise ValueError(f"unknown wind distribution {kind!r}")
+
+
+@dataclass(frozen=True)
+class Region:
+    id: int  # stable key for stored games, whatever the catalog order
+    storm_chance: float
+    reef_value: int  # million USD
+    lat: float  # reef site, degrees north
+    lon: float  # reef site, degrees east
+    wind: WindTable = field(default=None, compare=False, repr=False)
+    fragility: EcosystemFragility = field(default=DEFAULT_FRAGILITY, compare=False, repr=False)
+
+    def damage_fraction(self, wind_speed):
+        """Share of reef value a storm of ``wind_speed`` knots destroys (scalar or array)."""
+        return self.fragility.damage(wind_speed)
+
+
+def compile_region(spec):
+    if "storm_chance" in spec:
+        storm_chance = float(spec["storm_chance"])
+    else:
+        storm_chance = 1 - math.exp(-float(spec["annual_frequency"]))
+    return Region(
+        id=int(spec["id"]),
+        storm_chance=storm_chance,
+        reef_value=int(spec["reef_value"]),
+        lat=float(spec["lat"]),
+        lon=float(spec["lon"]),
+        wind=compile_wind(spec["wind"]),
+        fragility=EcosystemFragility(float(spec.get("mangrove_share", DEFAULT_FRAGILITY.mangrove_share))),
+    )
+
+
+def load_catalog(path=CATALOG_PATH):
+    """``{name: Region}`` in file order."""
+    with open(path, "rb") as f:
+        catalog = tomllib.load(f)
+    regions = {name: compile_region(spec) for name, spec in catalog.items()}
+    ids = [region.id for region in regions.values()]
+    if len(set(ids)) < len(ids) or not all(0 <= i < 255 for i in ids):
+        raise ValueError(f"{path}: region ids must be distinct and between 0 and 254")
+    return regions
+
+
+REGIONS = load_catalog()
+REGION_NAMES = {region.id: name for name, region in REGIONS.items()}
+
+
+def region_name(region_id):
+    """Name of the catalog region with ``region_id``."""
+    try:
+        return REGION_NAMES[region_id]
+    except KeyError:
+        raise ValueError(f"region id {region_id} is not in {CATALOG_PATH}") from None
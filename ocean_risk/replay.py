@@ -0,0 +1,179 @@
+"""Deterministic replay of recorded games, in bulk.
+
+A game is fully determined by its seed, its region and the sliders chosen
+each year: ``GameState.play_year`` draws year ``k`` from
+``year_rng(seed, k)``. ``replay_draws`` regenerates those draws for a whole
+batch of sessions, and ``replay`` rescores every session at once with the
+array form of ``score_year``, under the original rules or new ones.
+
+Run ``python -m ocean_risk.replay`` to check every leaderboard game and
+see how the cohort would grade under different score deltas.
+
+Draws for a region come from the track cache when one exists (see
+``ocean_risk.tracks``), so replay with the same cache the games were
+played with; ``verify`` flags any session that no longer matches.
+"""
+
+import argparse
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from ocean_risk.core import (
+    START_HEALTH,
+    START_SCORE,
+    V3_RULES,
+    ScoringRule,
+    draw_storm,
+    draw_wind_speed,
+    is_triggered,
+    payout_amount,
+    score_year,
+)
+from ocean_risk.fragility import DEFAULT_FRAGILITY
+from ocean_risk.playthrough import PlaythroughResults
+from ocean_risk.regions import REGIONS
+from ocean_risk.rng import year_rng
+from ocean_risk.tracks import draw_region_wind_speed
+
+
+@dataclass(frozen=True)
+class SessionBatch:
+    """Seeds, scenarios and decisions of recorded games, one row per session."""
+
+    seed: np.ndarray  # (sessions,)
+    first_round: np.ndarray  # round of the first recorded year
+    region: list  # region name, or None for the single-region games
+    storm_chance: np.ndarray
+    reef_value: np.ndarray
+    premium_percent: np.ndarray  # (sessions, years)
+    payout_percent: np.ndarray
+    trigger_speed: np.ndarray
+    recorded: PlaythroughResults  # final values the players saw
+
+    def __len__(self):
+        return len(self.seed)
+
+    @classmethod
+    def from_games(cls, games):
+        """Batch finished ``GameState`` objects; all must have played the same number of years."""
+        games = list(games)
+        years = {len(game.history) for game in games}
+        if len(years) > 1:
+            raise ValueError(f"games have different lengths: {sorted(years)}")
+
+        def decisions(field):
+            return np.array([[getattr(r, field) for r in game.history] for game in games],
+                            dtype=np.int16).reshape(len(games), -1)
+
+        return cls(
+            seed=np.array([game.seed for game in games], dtype=np.uint64),
+            first_round=np.array([game.round - len(game.history) for game in games]),
+            region=[game.region for game in games],
+            storm_chance=np.array([game.storm_chance for game in games]),
+            reef_value=np.array([game.reef_value for game in games]),
+            premium_percent=decisions("premium_percent"),
+            payout_percent=decisions("payout_percent"),
+            trigger_speed=decisions("trigger_speed"),
+            recorded=PlaythroughResults(
+                score=np.array([game.score for game in games]),
+                ecosystem_health=np.array([game.ecosystem_health for game in games]),
+                funds=np.array([game.funds for game in games]),
+            ),
+        )
+
+
+def replay_draws(batch):
+    """Regenerate every session's ``(wind_speed, storm_occurs)``, each ``(sessions, years)``."""
+    n_sessions, years = batch.trigger_speed.shape
+    wind_speed = np.empty((n_sessions, years), dtype=np.int16)
+    storm_occurs = np.empty((n_sessions, years), dtype=bool)
+    # One Philox stream per session-year, consumed exactly as play_year does.
+    for i in range(n_sessions):
+        seed, region, storm_chance = int(batch.seed[i]), batch.region[i], batch.storm_chance[i]
+        for year in range(years):
+            rng = year_rng(seed, int(batch.first_round[i]) + year)
+            if region is None:
+                wind_speed[i, year] = draw_wind_speed(rng=rng)
+            else:
+                wind_speed[i, year] = draw_region_wind_speed(region, rng=rng)
+            storm_occurs[i, year] = draw_storm(storm_chance, rng=rng)
+    return wind_speed, storm_occurs
+
+
+def replay(batch, rules=V3_RULES, draws=None):
+    """Final score, health and funds of every session under ``rules``.
+
+    Pass ``draws`` from ``replay_draws`` to rescore under several rules
+    without regenerating them.
+    """
+    wind_speed, storm_occurs = replay_draws(batch) if draws is None else draws
+    triggered = storm_occurs & is_triggered(wind_speed, batch.trigger_speed)
+    score_delta = np.empty(wind_speed.shape, dtype=np.int64)
+    health_delta = np.empty(wind_speed.shape, dtype=np.int64)
+    # Each region has its own fragility table.
+    for region in set(batch.region):
+        rows = np.array([r == region for r in batch.region])
+        fragility = DEFAULT_FRAGILITY if region is None else REGIONS[region].fragility
+        score_delta[rows], health_delta[rows] = score_year(storm_occurs[rows], triggered[rows], rules,
+                                                           wind_speed[rows], fragility)
+    payouts = payout_amount(batch.payout_percent, batch.reef_value[:, None])
+    return PlaythroughResults(
+        score=START_SCORE + score_delta.sum(axis=1),
+        ecosystem_health=START_HEALTH + health_delta.sum(axis=1),
+        funds=np.where(triggered, payouts, 0.0).sum(axis=1),
+    )
+
+
+def verify(batch, rules=V3_RULES, draws=None):
+    """Boolean mask of sessions whose replay reproduces the recorded totals."""
+    replayed = replay(batch, rules, draws)
+    return ((replayed.score == batch.recorded.score)
+            & (replayed.ecosystem_health == batch.recorded.ecosystem_health)
+            & np.isclose(replayed.funds, batch.recorded.funds))
+
+
+def _grade(score):
+    # The bands of the final report card in game_mode_v3_final.py.
+    return np.select([score >= 80, score >= 50], ["fantastic", "decent"], "setbacks")
+
+
+def main(argv=None):
+    from ocean_risk.leaderboard import DEFAULT_DB_PATH, get_leaderboard
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="leaderboard database")
+    parser.add_argument("--trigger-score", type=int, default=V3_RULES.trigger_score)
+    parser.add_argument("--miss-score", type=int, default=V3_RULES.miss_score)
+    parser.add_argument("--calm-score", type=int, default=V3_RULES.calm_score)
+    parser.add_argument("--miss-health", type=int, default=V3_RULES.miss_health)
+    parser.add_argument("--damage-health", type=int, default=V3_RULES.damage_health)
+    args = parser.parse_args(argv)
+
+    games = get_leaderboard(args.db).games()
+    if not games:
+        print(f"No games in {args.db}")
+        return
+    batch = SessionBatch.from_games(games)
+    start = time.perf_counter()
+    draws = replay_draws(batch)
+    matches = verify(batch, V3_RULES, draws)
+    seconds = time.perf_counter() - start
+    print(f"Replayed {len(batch):,} sessions in {seconds:.2f}s ({len(batch) / seconds:,.0f}/s); "
+          f"{matches.sum():,} match their recorded scores")
+
+    rules = ScoringRule(args.trigger_score, args.miss_score, args.calm_score, args.miss_health,
+                        args.damage_health)
+    old, new = batch.recorded.score, replay(batch, rules, draws).score
+    changed = _grade(old) != _grade(new)
+    print(f"Under {rules}: mean score {old.mean():.1f} -> {new.mean():.1f}, "
+          f"{changed.sum():,} sessions change grade")
+    for region in [*REGIONS, None]:
+        in_region = np.array([r == region for r in batch.region])
+        if in_region.any():
+            print(f"  {region or 'no region'}: {old[in_region].mean():.1f} -> {new[in_region].mean():.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Reproducible, independent random streams.
+
+Every stream is a Philox generator keyed by a root seed plus a tuple of
+integers naming what it is for: ``(STORM_DRAWS, year)`` for one year of a
+game, ``(PLAYTHROUGH, chunk)`` for one chunk of a batch run, and so on.
+Each tool has its own first key element, so two tools run with the same
+seed still draw different numbers. Streams
+with different keys never overlap, and the same seed and key always give
+the same numbers, in whatever process or order they are created. Big runs
+can be split across workers and still match a single-process run exactly.
+"""
+
+import secrets
+
+import numpy as np
+
+# First element of every stream key, one per consumer.
+STORM_DRAWS = 0  # one game year or one "Run Simulation" click
+PRICING = 1  # expected-value estimates shown next to the policy
+PLAYTHROUGH = 2  # chunks of batch playthroughs
+CLIMATE = 3  # multi-decade scenario projections
+OPTIMIZER = 4  # the storm histories the optimizer scores candidates on, per region
+PORTFOLIO = 5  # chunks of portfolio simulations
+PREMIUM_SURFACE = 6  # event set behind a premium surface, per risk level
+BASIS_SURFACE = 7  # event set behind a basis-risk surface, per region
+TAIL = 8  # chunks of tail-risk digests
+TOWER = 9  # region losses on the tower pricing page
+
+# Root seed of the statistics every session shares (surfaces, tail
+# digests, tower losses), so every server shows the same numbers.
+SHARED_SEED = 0
+
+
+def new_seed():
+    """A fresh root seed for a session or a batch run."""
+    return secrets.randbits(63)
+
+
+def stream(seed, *key):
+    """Generator for ``key`` under root ``seed``."""
+    return np.random.Generator(np.random.Philox(np.random.SeedSequence(seed, spawn_key=key)))
+
+
+def year_rng(seed, year):
+    """The stream behind one simulated game year (or one app click)."""
+    return stream(seed, STORM_DRAWS, year)
+
+
+def spawn(seed, n, *key):
+    """``n`` independent child streams, e.g. one per pool worker."""
+    return [stream(seed, *key, i) for i in range(n)]
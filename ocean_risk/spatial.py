@@ -0,0 +1,90 @@
+"""Uniform latitude/longitude grid index over track points.
+
+Points are bucketed into ``cell_deg`` x ``cell_deg`` cells and stored
+sorted by cell, with an offset array marking where each cell starts (the
+same layout as a CSR sparse matrix). A radius query only visits the cells
+overlapping the query's bounding box and then checks exact great-circle
+distances on those few candidates. Queries for many sites are expanded
+into one flat candidate array, so there is no Python loop over sites.
+"""
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180
+POLAR_LAT = 89.0  # queries reaching this latitude scan whole rows
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(x, dtype=np.float64)) for x in (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def _expand_ranges(starts, lengths):
+    """Concatenate ``range(start, start + length)`` for every pair, plus each value's owner."""
+    owner = np.repeat(np.arange(len(starts)), lengths)
+    first = np.cumsum(lengths) - lengths
+    return owner, np.repeat(starts, lengths) + np.arange(owner.size) - np.repeat(first, lengths)
+
+
+class GridIndex:
+    def __init__(self, lat, lon, storm_id=None, cell_deg=1.0):
+        self.lat = np.asarray(lat)
+        self.lon = np.asarray(lon)
+        self.storm_id = None if storm_id is None else np.asarray(storm_id)
+        self.cell_deg = cell_deg
+        self.n_rows = int(np.ceil(180 / cell_deg))
+        self.n_cols = int(np.ceil(360 / cell_deg))
+
+        cells = self._cell(self._row(self.lat), self._col(self.lon))
+        self.order = np.argsort(cells, kind="stable").astype(np.int64)
+        self.cell_start = np.searchsorted(cells[self.order], np.arange(self.n_rows * self.n_cols + 1))
+
+    def _row(self, lat):
+        return np.clip(np.floor((np.asarray(lat) + 90) / self.cell_deg).astype(np.int64), 0, self.n_rows - 1)
+
+    def _col(self, lon):
+        return np.floor((np.asarray(lon) + 180) / self.cell_deg).astype(np.int64) % self.n_cols
+
+    def _cell(self, row, col):
+        return row * self.n_cols + col
+
+    def query_many(self, lats, lons, radius_km):
+        """Return ``(site, point)`` index pairs for every point within ``radius_km`` of a site."""
+        lats = np.atleast_1d(np.asarray(lats, dtype=np.float64))
+        lons = np.atleast_1d(np.asarray(lons, dtype=np.float64))
+        dlat = radius_km / KM_PER_DEGREE
+        row_lo, row_hi = self._row(lats - dlat), self._row(lats + dlat)
+        # Longitude degrees shrink towards the poles; near them, and for any
+        # circle reaching over a pole, scan whole rows.
+        polar = np.abs(lats) + dlat >= POLAR_LAT
+        widest = np.cos(np.radians(np.minimum(np.abs(lats) + dlat, POLAR_LAT)))
+        dlon = dlat / widest
+        col_lo = np.where(polar, 0, self._col(lons - dlon))
+        n_cols = np.where(polar, self.n_cols,
+                          np.minimum(np.floor((lons + dlon + 180) / self.cell_deg).astype(np.int64)
+                                     - np.floor((lons - dlon + 180) / self.cell_deg).astype(np.int64) + 1,
+                                     self.n_cols))
+        n_rows = row_hi - row_lo + 1
+
+        site, k = _expand_ranges(np.zeros(len(lats), dtype=np.int64), n_rows * n_cols)
+        cells = self._cell(row_lo[site] + k // n_cols[site], (col_lo[site] + k % n_cols[site]) % self.n_cols)
+        starts = self.cell_start[cells]
+        owner, slot = _expand_ranges(starts, self.cell_start[cells + 1] - starts)
+        site, point = site[owner], self.order[slot]
+
+        near = haversine_km(lats[site], lons[site], self.lat[point], self.lon[point]) <= radius_km
+        return site[near], point[near]
+
+    def query(self, lat, lon, radius_km):
+        """Indices of points within ``radius_km`` of one site."""
+        return self.query_many(lat, lon, radius_km)[1]
+
+    def storms_near(self, lats, lons, radius_km):
+        """Distinct ``(site, storm_id)`` pairs for storms passing within ``radius_km``."""
+        site, point = self.query_many(lats, lons, radius_km)
+        n_storms = int(self.storm_id.max()) + 1 if self.storm_id.size else 1
+        pairs = np.unique(site * n_storms + self.storm_id[point])
+        return pairs // n_storms, pairs % n_storms
@@ -0,0 +1,126 @@
+"""Typed per-session game state.
+
+``GameState`` replaces the loose ``st.session_state`` keys the games used
+to keep (round, score, health, funds, region, role, ...) with one slotted
+object holding the full per-year history. ``play_year`` applies one
+"Simulate Storm Event" click using the session's seeded stream for that
+year, so a state can be replayed from its seed and decisions. The whole
+state packs into well under 200 bytes with ``to_bytes``.
+"""
+
+import struct
+from dataclasses import dataclass, field
+
+from ocean_risk.core import (
+    ROLES,
+    START_HEALTH,
+    START_SCORE,
+    V3_RULES,
+    draw_storm,
+    draw_wind_speed,
+    is_triggered,
+    payout_amount,
+    score_year,
+)
+from ocean_risk.fragility import DEFAULT_FRAGILITY
+from ocean_risk.regions import REGIONS, region_name
+from ocean_risk.rng import new_seed, year_rng
+from ocean_risk.tracks import draw_region_wind_speed
+
+_NONE = 255
+_HEADER = struct.Struct("<BhhdBBdHqB")  # round .. seed, history length
+_YEAR = struct.Struct("<BBBBBbbd")
+
+
+@dataclass(slots=True)
+class YearRecord:
+    premium_percent: int
+    payout_percent: int
+    trigger_speed: int
+    wind_speed: int
+    storm_occurs: bool
+    triggered: bool
+    score_delta: int
+    health_delta: int
+    payout_amount: float  # million USD
+
+
+@dataclass(slots=True)
+class GameState:
+    round: int = 0
+    score: int = START_SCORE
+    ecosystem_health: int = START_HEALTH
+    funds: float = 0.0
+    region: str | None = None
+    role: str | None = None
+    storm_chance: float = 0.0
+    reef_value: int = 0
+    seed: int = field(default_factory=new_seed)
+    history: list[YearRecord] = field(default_factory=list)
+
+    def start(self, region, role):
+        """Pick the scenario and load the region preset."""
+        self.region, self.role = region, role
+        self.storm_chance = REGIONS[region].storm_chance
+        self.reef_value = REGIONS[region].reef_value
+
+    def play_year(self, premium_percent, payout_percent, trigger_speed, rules=V3_RULES):
+        """Simulate the current year, update the totals and return its record."""
+        rng = year_rng(self.seed, self.round)
+        if self.region is None:
+            wind_speed = draw_wind_speed(rng=rng)
+        else:
+            wind_speed = draw_region_wind_speed(self.region, rng=rng)
+        storm_occurs = draw_storm(self.storm_chance, rng=rng)
+        triggered = storm_occurs and is_triggered(wind_speed, trigger_speed)
+        fragility = DEFAULT_FRAGILITY if self.region is None else REGIONS[self.region].fragility
+        score_delta, health_delta = score_year(storm_occurs, triggered, rules, wind_speed,
+                                               fragility)
+
+        record = YearRecord(
+            premium_percent=premium_percent,
+            payout_percent=payout_percent,
+            trigger_speed=trigger_speed,
+            wind_speed=wind_speed,
+            storm_occurs=storm_occurs,
+            triggered=triggered,
+            score_delta=score_delta,
+            health_delta=health_delta,
+            payout_amount=payout_amount(payout_percent, self.reef_value) if triggered else 0.0,
+        )
+        self.history.append(record)
+        self.score += score_delta
+        self.ecosystem_health += health_delta
+        self.funds += record.payout_amount
+        self.round += 1
+        return record
+
+    def to_bytes(self):
+        parts = [_HEADER.pack(
+            self.round, self.score, self.ecosystem_health, self.funds,
+            _NONE if self.region is None else REGIONS[self.region].id,
+            _NONE if self.role is None else ROLES.index(self.role),
+            self.storm_chance, self.reef_value, self.seed, len(self.history),
+        )]
+        parts += [_YEAR.pack(r.premium_percent, r.payout_percent, r.trigger_speed, r.wind_speed,
+                             r.storm_occurs | r.triggered << 1, r.score_delta, r.health_delta,
+                             r.payout_amount)
+                  for r in self.history]
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        (round_, score, health, funds, region, role, storm_chance, reef_value, seed,
+         n_years) = _HEADER.unpack_from(data)
+        history = []
+        for offset in range(_HEADER.size, _HEADER.size + n_years * _YEAR.size, _YEAR.size):
+            premium, payout, trigger, wind, flags, score_delta, health_delta, amount = \
+                _YEAR.unpack_from(data, offset)
+            history.append(YearRecord(premium, payout, trigger, wind, bool(flags & 1),
+                                      bool(flags & 2), score_delta, health_delta, amount))
+        return cls(
+            round=round_, score=score, ecosystem_health=health, funds=funds,
+            region=None if region == _NONE else region_name(region),
+            role=None if role == _NONE else ROLES[role],
+            storm_chance=storm_chance, reef_value=reef_value, seed=seed, history=history,
+        )
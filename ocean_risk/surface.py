@@ -0,0 +1,59 @@
+"""Fair-premium surface over every trigger and payout slider setting.
+
+The trigger slider runs from 80 to 160 knots and the payout slider from 10
+to 100 %, so a risk level has only 81 x 91 possible policies. One batch of
+simulated storm-years (an ``EventSet``) gives the trigger probability at
+every threshold, and the fair (break-even) premium of each policy follows
+directly:
+
+    fair premium % = P(payout in a year) x payout %
+
+The apps build the surface once per process and then index into it.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from ocean_risk.core import RISK_CHANCES
+from ocean_risk.events import EventSet
+from ocean_risk.pricing import DEFAULT_YEARS
+
+TRIGGER_MIN, TRIGGER_MAX = 80, 160
+PAYOUT_MIN, PAYOUT_MAX = 10, 100
+
+
+def grid_index(trigger_speed, payout_percent):
+    """Row and column of a policy in a surface; ``ValueError`` outside the slider grid."""
+    if not (TRIGGER_MIN <= trigger_speed <= TRIGGER_MAX and PAYOUT_MIN <= payout_percent <= PAYOUT_MAX):
+        raise ValueError(f"trigger {trigger_speed} kn and payout {payout_percent}% must be within "
+                         f"{TRIGGER_MIN}-{TRIGGER_MAX} kn and {PAYOUT_MIN}-{PAYOUT_MAX}%")
+    return int(trigger_speed - TRIGGER_MIN), int(payout_percent - PAYOUT_MIN)
+
+
+@dataclass(frozen=True)
+class PremiumSurface:
+    storm_risk: str
+    triggers: np.ndarray  # knots, shape (n_triggers,)
+    payouts: np.ndarray  # % of value, shape (n_payouts,)
+    trigger_probability: np.ndarray  # shape (n_triggers,)
+    fair_premium_percent: np.ndarray  # shape (n_triggers, n_payouts)
+
+    def lookup(self, trigger_speed, payout_percent):
+        """Return ``(fair_premium_percent, trigger_probability)`` for a policy."""
+        i, j = grid_index(trigger_speed, payout_percent)
+        return float(self.fair_premium_percent[i, j]), float(self.trigger_probability[i])
+
+
+def build_premium_surface(storm_risk, n_years=DEFAULT_YEARS, rng=None):
+    events = EventSet.simulate(RISK_CHANCES[storm_risk], n_years, rng)
+    triggers = np.arange(TRIGGER_MIN, TRIGGER_MAX + 1)
+    payouts = np.arange(PAYOUT_MIN, PAYOUT_MAX + 1)
+    trigger_probability = events.trigger_probability(triggers)
+    return PremiumSurface(
+        storm_risk=storm_risk,
+        triggers=triggers,
+        payouts=payouts,
+        trigger_probability=trigger_probability,
+        fair_premium_percent=np.outer(trigger_probability, payouts),
+    )
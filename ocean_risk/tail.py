@@ -0,0 +1,175 @@
+"""Return-period losses and TVaR of the single-reef policy, in fixed memory.
+
+Uses the storm model of ``ocean_risk.pricing``, with each storm destroying
+the share of the reef given by the default fragility curves. Storm-years
+are drawn a chunk at a time and streamed into t-digests (see
+``ocean_risk.sketch``) of the reef's annual damage and of the damage left
+uncovered by the payout, so memory stays fixed however many years are
+simulated. Chunks can be split across worker processes, whose digests
+merge.
+
+The apps use ``exact_tail_risk`` instead. With one storm a year at most and
+whole-knot wind speeds, a year's loss takes one of a hundred-odd values
+with known probabilities, so its quantiles and TVaR follow exactly from
+that distribution in microseconds, with no simulation at all.
+
+Run ``python -m ocean_risk.tail`` for a 100-million-year run, checked
+against the exact figures.
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from ocean_risk.core import (
+    RISK_CHANCES,
+    WIND_MAX,
+    WIND_MIN,
+    draw_storm,
+    draw_wind_speed,
+    is_triggered,
+    payout_amount,
+)
+from ocean_risk.fragility import DEFAULT_FRAGILITY
+from ocean_risk.pricing import DEFAULT_YEARS
+from ocean_risk.rng import TAIL, new_seed, stream
+from ocean_risk.sketch import TDigest
+
+CHUNK_YEARS = 1_000_000
+RETURN_PERIODS = (10, 100, 250)
+
+
+class DiscreteLoss:
+    """A loss that takes finitely many values, with the quantile interface of ``TDigest``."""
+
+    def __init__(self, values, probabilities):
+        values, inverse = np.unique(np.asarray(values, dtype=np.float64), return_inverse=True)
+        self.values = values
+        self.probabilities = np.bincount(inverse, weights=probabilities, minlength=len(values))
+
+    def quantile(self, q):
+        """Smallest loss not exceeded with probability ``q``; ``q`` may be an array."""
+        # The tolerance keeps q = 0.99 on a value whose cumulative probability sums to 0.98999...
+        i = np.searchsorted(np.cumsum(self.probabilities), np.asarray(q) - 1e-12)
+        quantile = self.values[np.minimum(i, len(self.values) - 1)]
+        return float(quantile) if quantile.ndim == 0 else quantile
+
+    def tail_mean(self, q):
+        """Average loss in the worst ``1 - q`` of years (the TVaR at ``q``)."""
+        tail = 1 - q
+        probabilities = self.probabilities[::-1]
+        above = np.cumsum(probabilities) - probabilities  # probability above each value
+        taken = np.clip(tail - above, 0, probabilities)
+        return float((taken * self.values[::-1]).sum() / tail)
+
+    def return_period_loss(self, years):
+        """Loss exceeded on average once every ``years`` years."""
+        return self.quantile(1 - 1 / np.asarray(years, dtype=np.float64))
+
+
+@dataclass(frozen=True)
+class TailRisk:
+    """Distributions of one policy's annual losses in million USD."""
+
+    damage: TDigest | DiscreteLoss  # reef value destroyed by storms
+    uncovered: TDigest | DiscreteLoss  # damage minus the payout, floored at zero
+    n_years: int | None  # simulated years; None for exact figures
+
+    def return_period_losses(self, periods=RETURN_PERIODS):
+        """``{years: (damage, uncovered)}``: the probable maximum loss once every ``years``."""
+        return {years: (float(self.damage.return_period_loss(years)),
+                        float(self.uncovered.return_period_loss(years))) for years in periods}
+
+    def tvar(self, years=100):
+        """Average ``(damage, uncovered)`` loss in the years worse than the 1-in-``years`` loss."""
+        level = 1 - 1 / years
+        return self.damage.tail_mean(level), self.uncovered.tail_mean(level)
+
+
+def exact_tail_risk(reef_value, storm_risk, payout_percent, trigger_speed, fragility=DEFAULT_FRAGILITY):
+    """``TailRisk`` of the storm model computed exactly, one outcome per wind speed."""
+    storm_chance = RISK_CHANCES[storm_risk]
+    wind_speed = np.arange(WIND_MIN, WIND_MAX + 1)
+    probabilities = np.r_[1 - storm_chance, np.full(len(wind_speed), storm_chance / len(wind_speed))]
+    loss = fragility.damage(wind_speed) * reef_value
+    paid = np.where(is_triggered(wind_speed, trigger_speed), payout_amount(payout_percent, reef_value), 0.0)
+    return TailRisk(damage=DiscreteLoss(np.r_[0.0, loss], probabilities),
+                    uncovered=DiscreteLoss(np.r_[0.0, np.maximum(loss - paid, 0)], probabilities),
+                    n_years=None)
+
+
+def _digest_chunks(reef_value, storm_risk, payout_percent, trigger_speed, seed, chunks, chunk_years,
+                   n_years):
+    damage, uncovered = TDigest(), TDigest()
+    payout = payout_amount(payout_percent, reef_value)
+    for chunk in chunks:
+        size = min(chunk_years, n_years - chunk * chunk_years)
+        rng = stream(seed, TAIL, chunk)
+        storm_happens = draw_storm(RISK_CHANCES[storm_risk], size, rng)
+        wind_speed = draw_wind_speed(size, rng)
+        loss = np.where(storm_happens, DEFAULT_FRAGILITY.damage(wind_speed) * reef_value, 0.0)
+        paid = np.where(storm_happens & is_triggered(wind_speed, trigger_speed), payout, 0.0)
+        damage.update(loss)
+        uncovered.update(np.maximum(loss - paid, 0))
+    return damage, uncovered
+
+
+def simulate_tail_risk(reef_value, storm_risk, payout_percent, trigger_speed, n_years=DEFAULT_YEARS,
+                       seed=None, chunk_years=CHUNK_YEARS, max_workers=1):
+    """Stream ``n_years`` storm-years through t-digests of the annual losses.
+
+    Chunk ``i`` is drawn from ``stream(seed, TAIL, i)``. With
+    ``max_workers > 1`` the chunks are dealt out to worker processes and
+    their digests merged.
+    """
+    seed = new_seed() if seed is None else seed
+    chunks = range(-(-n_years // chunk_years))
+    args = (reef_value, storm_risk, payout_percent, trigger_speed, seed)
+    if max_workers == 1:
+        damage, uncovered = _digest_chunks(*args, chunks, chunk_years, n_years)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            parts = list(pool.map(_digest_chunks, *zip(*[
+                (*args, chunks[i::max_workers], chunk_years, n_years) for i in range(max_workers)])))
+        damage, uncovered = parts[0]
+        for part_damage, part_uncovered in parts[1:]:
+            damage.merge(part_damage)
+            uncovered.merge(part_uncovered)
+    return TailRisk(damage=damage, uncovered=uncovered, n_years=n_years)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reef-value", type=float, default=500)
+    parser.add_argument("--risk", choices=list(RISK_CHANCES), default="Medium")
+    parser.add_argument("--payout", type=int, default=60)
+    parser.add_argument("--trigger", type=int, default=100)
+    parser.add_argument("--years", type=int, default=100_000_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    seed = new_seed() if args.seed is None else args.seed
+    start = time.perf_counter()
+    risk = simulate_tail_risk(args.reef_value, args.risk, args.payout, args.trigger, args.years, seed,
+                              max_workers=args.workers or os.cpu_count() or 1)
+    seconds = time.perf_counter() - start
+    print(f"seed {seed}: {args.years:,} years in {seconds:.1f}s")
+    for years, (damage, uncovered) in risk.return_period_losses((10, 25, 50, 100, 250, 500)).items():
+        print(f"  1-in-{years} year damage ${damage:,.1f}M, uncovered ${uncovered:,.1f}M")
+    damage, uncovered = risk.tvar(100)
+    print(f"  TVaR beyond 1-in-100: damage ${damage:,.1f}M, uncovered ${uncovered:,.1f}M")
+    exact = exact_tail_risk(args.reef_value, args.risk, args.payout, args.trigger)
+    print("Exact:")
+    for years, (damage, uncovered) in exact.return_period_losses((10, 25, 50, 100, 250, 500)).items():
+        print(f"  1-in-{years} year damage ${damage:,.1f}M, uncovered ${uncovered:,.1f}M")
+    damage, uncovered = exact.tvar(100)
+    print(f"  TVaR beyond 1-in-100: damage ${damage:,.1f}M, uncovered ${uncovered:,.1f}M")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Layered reinsurance and cat-bond tower pricing on simulated losses.
+
+A tower splits a trust fund's losses into layers. A layer attaching at
+``a`` with limit ``l`` pays ``min(max(loss - a, 0), l)`` of each loss,
+times the ``share`` placed; an aggregate limit caps what it pays in a
+year. Cat-bond tranches are the same layers, usually with one event's
+worth of aggregate limit.
+
+``price_tower`` takes annual losses, or individual event losses with
+their years, and evaluates every layer at once on ``(years, layers)``
+blocks: there is no loop over layers, only over blocks of years, so
+memory stays bounded for any number of simulated years.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from ocean_risk.core import draw_storm
+from ocean_risk.regions import REGIONS
+from ocean_risk.tracks import region_wind
+
+CHUNK_YEARS = 65_536
+RISK_LOAD = 0.3  # technical premium = expected loss + RISK_LOAD x standard deviation
+
+
+@dataclass(frozen=True)
+class Tower:
+    attachment: np.ndarray  # million USD, one entry per layer
+    limit: np.ndarray  # million USD per occurrence
+    aggregate_limit: np.ndarray  # million USD per year; inf for none
+    share: np.ndarray  # share of the layer placed
+
+    def __post_init__(self):
+        for name in ("attachment", "limit", "aggregate_limit", "share"):
+            object.__setattr__(self, name, np.asarray(getattr(self, name), dtype=np.float64))
+
+    def __len__(self):
+        return len(self.attachment)
+
+    @property
+    def exhaustion(self):
+        return self.attachment + self.limit
+
+    @classmethod
+    def layers(cls, attachment, limit, aggregate_limit=None, share=None):
+        attachment = np.atleast_1d(np.asarray(attachment, dtype=np.float64))
+        shape = attachment.shape
+        return cls(
+            attachment=attachment,
+            limit=np.broadcast_to(limit, shape),
+            aggregate_limit=np.broadcast_to(np.inf if aggregate_limit is None else aggregate_limit, shape),
+            share=np.broadcast_to(1.0 if share is None else share, shape),
+        )
+
+    @classmethod
+    def stacked(cls, first_attachment, top, n_layers, **kwargs):
+        """``n_layers`` contiguous, equal-width layers from ``first_attachment`` to ``top``."""
+        edges = np.linspace(first_attachment, top, n_layers + 1)
+        return cls.layers(edges[:-1], np.diff(edges), **kwargs)
+
+
+@dataclass(frozen=True)
+class LayerPricing:
+    """Per-layer results, one entry per layer; amounts in million USD per year."""
+
+    expected_loss: np.ndarray
+    std_loss: np.ndarray
+    attachment_probability: np.ndarray  # chance the layer pays anything in a year
+    exhaustion_probability: np.ndarray  # chance it pays its full yearly capacity
+    technical_premium: np.ndarray
+    rate_on_line: np.ndarray  # technical premium / placed limit
+    n_years: int
+
+
+def _annual_recoveries(tower, losses, year=None, n_years=None):
+    """Yearly recovery of every layer, shape ``(years, layers)``."""
+    recovered = np.clip(losses[:, None] - tower.attachment, 0, tower.limit)
+    if year is not None:
+        annual = np.zeros((n_years, len(tower)))
+        years, first = np.unique(year, return_index=True)
+        annual[years] = np.add.reduceat(recovered, first, axis=0)
+        recovered = annual
+    return np.minimum(recovered, tower.aggregate_limit)
+
+
+def price_tower(tower, annual_loss=None, *, event_loss=None, event_year=None, n_years=None,
+                risk_load=RISK_LOAD, chunk_years=CHUNK_YEARS):
+    """Price every layer of ``tower``.
+
+    Pass ``annual_loss`` (one entry per simulated year), or ``event_loss``
+    with ``event_year`` (sorted by year) and ``n_years`` when a year can
+    have several events that each erode the layer.
+    """
+    if annual_loss is not None:
+        annual_loss = np.asarray(annual_loss, dtype=np.float64)
+        n_years = len(annual_loss)
+    else:
+        event_loss = np.asarray(event_loss, dtype=np.float64)
+        event_year = np.asarray(event_year)
+        bounds = np.searchsorted(event_year, np.arange(0, n_years + chunk_years, chunk_years))
+
+    capacity = np.where(np.isfinite(tower.aggregate_limit), tower.aggregate_limit, tower.limit)
+    total = np.zeros(len(tower))
+    total_sq = np.zeros(len(tower))
+    attached = np.zeros(len(tower), dtype=np.int64)
+    exhausted = np.zeros(len(tower), dtype=np.int64)
+    for chunk, start in enumerate(range(0, n_years, chunk_years)):
+        stop = min(start + chunk_years, n_years)
+        if annual_loss is not None:
+            annual = _annual_recoveries(tower, annual_loss[start:stop])
+        else:
+            events = slice(bounds[chunk], bounds[chunk + 1])
+            annual = _annual_recoveries(tower, event_loss[events], event_year[events] - start, stop - start)
+        total += annual.sum(axis=0)
+        total_sq += (annual * annual).sum(axis=0)
+        attached += (annual > 0).sum(axis=0)
+        exhausted += (annual >= capacity * (1 - 1e-9)).sum(axis=0)
+
+    mean = total / n_years
+    std = np.sqrt(np.maximum(total_sq / n_years - mean**2, 0))
+    expected_loss, std_loss = mean * tower.share, std * tower.share
+    premium = expected_loss + risk_load * std_loss
+    return LayerPricing(
+        expected_loss=expected_loss,
+        std_loss=std_loss,
+        attachment_probability=attached / n_years,
+        exhaustion_probability=exhausted / n_years,
+        technical_premium=premium,
+        rate_on_line=premium / (capacity * tower.share),
+        n_years=n_years,
+    )
+
+
+def region_annual_losses(region, n_years, rng=None):
+    """Simulated yearly reef damage in million USD, from the region's storms and fragility curves."""
+    preset = REGIONS[region]
+    storm = draw_storm(preset.storm_chance, n_years, rng)
+    wind_speed = region_wind(region).sample(n_years, rng)
+    return np.where(storm, preset.damage_fraction(wind_speed) * preset.reef_value, 0.0)
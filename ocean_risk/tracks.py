@@ -0,0 +1,274 @@
+"""Historical hurricane tracks in a memory-mapped columnar cache.
+
+Best-track files (HURDAT2 text or IBTrACS-style CSV) are parsed line by
+line and written to one ``.npy`` file per field:
+
+    storm_id.npy   int32    index into storms.txt
+    time.npy       int64    seconds since 1970-01-01 UTC
+    lat.npy        float32  degrees north
+    lon.npy        float32  degrees east, -180 to 180
+    max_wind.npy   float32  knots, NaN when missing
+
+Build a cache with ``python -m ocean_risk.tracks build FILE [FILE ...]``.
+``TrackArchive.open`` maps the arrays read-only, so opening a multi-decade
+archive takes milliseconds and only touched pages are ever loaded.
+
+When a cache exists a game region's wind distribution (``region_wind``) is
+built from the storms that passed near its reef, taking each storm's peak
+wind at the reef itself from a Holland wind profile; otherwise it is the
+distribution in the region catalog. Every simulation of a region -- the
+game, replay, playthroughs, the optimizer, basis risk, towers and the
+climate outlook -- draws from ``region_wind``.
+"""
+
+import argparse
+import csv
+import functools
+import os
+import shutil
+from array import array
+from pathlib import Path
+
+import numpy as np
+
+from ocean_risk.regions import REGIONS, WindTable
+from ocean_risk.spatial import GridIndex
+from ocean_risk.windfield import site_max_wind
+
+DEFAULT_CACHE_DIR = Path(os.environ.get(
+    "OCEAN_RISK_TRACK_CACHE", Path(__file__).resolve().parent.parent / "data" / "track_cache"))
+REGION_RADIUS_KM = 200
+CHUNK_ROWS = 65_536
+
+FIELDS = {
+    "storm_id": np.int32,
+    "time": np.int64,
+    "lat": np.float32,
+    "lon": np.float32,
+    "max_wind": np.float32,
+}
+_ARRAY_CODES = {"storm_id": "i", "time": "q", "lat": "f", "lon": "f", "max_wind": "f"}
+
+
+def _hurdat2_coordinate(text):
+    value = float(text[:-1])
+    return -value if text[-1] in "SW" else value
+
+
+def parse_hurdat2(lines):
+    """Yield ``(storm_key, name, iso_time, lat, lon, max_wind)`` from HURDAT2 lines."""
+    storm_key = name = None
+    for line in lines:
+        fields = [field.strip() for field in line.split(",")]
+        if len(fields) < 7:
+            if len(fields) >= 3 and fields[0]:
+                storm_key, name = fields[0], fields[1]
+            continue
+        date, hhmm = fields[0], fields[1].zfill(4)
+        wind = float(fields[6])
+        yield (storm_key, name,
+               f"{date[:4]}-{date[4:6]}-{date[6:8]}T{hhmm[:2]}:{hhmm[2:]}",
+               _hurdat2_coordinate(fields[4]), _hurdat2_coordinate(fields[5]),
+               wind if wind >= 0 else float("nan"))
+
+
+def parse_ibtracs(lines):
+    """Yield track points from an IBTrACS-style CSV (SID, NAME, ISO_TIME, LAT, LON, *_WIND)."""
+    reader = csv.DictReader(lines)
+    wind_columns = [c for c in ("USA_WIND", "WMO_WIND", "MAX_WIND", "WIND") if c in reader.fieldnames]
+    for row in reader:
+        try:
+            lat, lon = float(row["LAT"]), float(row["LON"])
+        except ValueError:
+            continue  # IBTrACS repeats a units row under the header
+        wind = float("nan")
+        for column in wind_columns:
+            if row[column].strip():
+                wind = float(row[column])
+                break
+        yield (row["SID"], row.get("NAME", ""), row["ISO_TIME"].replace(" ", "T"),
+               lat, (lon + 180) % 360 - 180, wind)
+
+
+def _parser_for(path, first_line):
+    if path.suffix.lower() == ".csv" or first_line.startswith("SID"):
+        return parse_ibtracs
+    return parse_hurdat2
+
+
+class _ColumnWriter:
+    """Append rows to raw per-field files in fixed-size chunks."""
+
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self.files = {field: open(out_dir / f"{field}.tmp", "wb") for field in FIELDS}
+        self.times = []
+        self.buffers = {field: array(_ARRAY_CODES[field]) for field in FIELDS if field != "time"}
+        self.length = 0
+
+    def append(self, storm_id, iso_time, lat, lon, max_wind):
+        self.buffers["storm_id"].append(storm_id)
+        self.times.append(iso_time)
+        self.buffers["lat"].append(lat)
+        self.buffers["lon"].append(lon)
+        self.buffers["max_wind"].append(max_wind)
+        if len(self.times) >= CHUNK_ROWS:
+            self.flush()
+
+    def flush(self):
+        seconds = np.array(self.times, dtype="datetime64[s]").astype(np.int64)
+        seconds.tofile(self.files["time"])
+        for field, buffer in self.buffers.items():
+            buffer.tofile(self.files[field])
+            del buffer[:]
+        self.length += len(self.times)
+        self.times = []
+
+    def close(self):
+        self.flush()
+        for field, dtype in FIELDS.items():
+            self.files[field].close()
+            raw = self.out_dir / f"{field}.tmp"
+            final = np.lib.format.open_memmap(self.out_dir / f"{field}.npy", mode="w+",
+                                              dtype=dtype, shape=(self.length,))
+            if self.length:
+                final[:] = np.memmap(raw, dtype=dtype, mode="r", shape=(self.length,))
+            final.flush()
+            del final
+            raw.unlink()
+
+
+def build_cache(paths, out_dir=DEFAULT_CACHE_DIR):
+    """Parse best-track files into a columnar cache and return the point count."""
+    out_dir = Path(out_dir)
+    tmp_dir = out_dir.with_name(out_dir.name + ".partial")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    storm_ids = {}
+    writer = _ColumnWriter(tmp_dir)
+    for path in map(Path, paths):
+        with open(path, newline="", encoding="utf-8") as lines:
+            parser = _parser_for(path, lines.readline())
+            lines.seek(0)
+            for storm_key, name, iso_time, lat, lon, wind in parser(lines):
+                storm_id = storm_ids.setdefault((storm_key, name), len(storm_ids))
+                writer.append(storm_id, iso_time, lat, lon, wind)
+    writer.close()
+    with open(tmp_dir / "storms.txt", "w", encoding="utf-8") as f:
+        f.writelines(f"{key},{name}\n" for key, name in storm_ids)
+
+    shutil.rmtree(out_dir, ignore_errors=True)
+    tmp_dir.rename(out_dir)
+    return writer.length
+
+
+class TrackArchive:
+    """Read-only, memory-mapped view of a track cache."""
+
+    def __init__(self, cache_dir, columns, storms):
+        self.cache_dir = cache_dir
+        self.storm_id = columns["storm_id"]
+        self.time = columns["time"]
+        self.lat = columns["lat"]
+        self.lon = columns["lon"]
+        self.max_wind = columns["max_wind"]
+        self.storms = storms
+
+    @classmethod
+    def open(cls, cache_dir=DEFAULT_CACHE_DIR):
+        cache_dir = Path(cache_dir)
+        columns = {field: np.load(cache_dir / f"{field}.npy", mmap_mode="r") for field in FIELDS}
+        with open(cache_dir / "storms.txt", encoding="utf-8") as f:
+            storms = [line.rstrip("\n") for line in f]
+        return cls(cache_dir, columns, storms)
+
+    def __len__(self):
+        return len(self.storm_id)
+
+    def years(self):
+        """Number of calendar years the archive spans."""
+        if not len(self):
+            return 0
+        first, last = np.datetime64(int(self.time.min()), "s"), np.datetime64(int(self.time.max()), "s")
+        return int(last.astype("datetime64[Y]").astype(int) - first.astype("datetime64[Y]").astype(int)) + 1
+
+    @functools.cached_property
+    def index(self):
+        """Grid index over every track point, built on first use."""
+        return GridIndex(self.lat, self.lon, self.storm_id)
+
+    def site_winds(self, lat, lon, radius_km=REGION_RADIUS_KM):
+        """Peak wind at a site of each storm passing within ``radius_km`` of it."""
+        near = self.index.query(lat, lon, radius_km)
+        # Add the fixes either side, so every segment that enters the radius is followed.
+        point = np.unique(np.concatenate([near - 1, near, near + 1]).clip(0, len(self) - 1))
+        point = point[~np.isnan(self.max_wind[point])]
+        # Points are stored storm by storm, so sorted indices stay grouped, and
+        # neighbouring indices of one storm are consecutive fixes.
+        storm = self.storm_id[point]
+        connected = (np.diff(point) == 1) & (storm[1:] == storm[:-1])
+        _, local_id = np.unique(storm, return_inverse=True)
+        winds = site_max_wind(local_id, self.lat[point], self.lon[point], self.max_wind[point],
+                              [lat], [lon], connected=connected)[:, 0]
+        # A fix added across a storm boundary belongs to a storm that never came near.
+        return winds[np.isin(np.unique(storm), self.storm_id[near])]
+
+
+@functools.lru_cache(maxsize=None)
+def open_archive(cache_dir=DEFAULT_CACHE_DIR):
+    """The archive at ``cache_dir``, or ``None`` when no cache has been built."""
+    if not (Path(cache_dir) / "storms.txt").exists():
+        return None
+    return TrackArchive.open(cache_dir)
+
+
+@functools.lru_cache(maxsize=None)
+def region_wind_speeds(region, cache_dir=DEFAULT_CACHE_DIR):
+    """Historical storm wind speeds near a game region's reef, or ``None``."""
+    archive = open_archive(cache_dir)
+    if archive is None:
+        return None
+    preset = REGIONS[region]
+    winds = archive.site_winds(preset.lat, preset.lon)
+    return winds if len(winds) else None
+
+
+@functools.lru_cache(maxsize=None)
+def region_wind(region, cache_dir=DEFAULT_CACHE_DIR):
+    """``WindTable`` of a game region: its historical storms when cached, else the catalog's."""
+    winds = region_wind_speeds(region, cache_dir)
+    if winds is None:
+        return REGIONS[region].wind
+    values, counts = np.unique(np.rint(winds).astype(np.int16), return_counts=True)
+    return WindTable(values, counts)
+
+
+def draw_region_wind_speed(region, size=None, rng=None, cache_dir=DEFAULT_CACHE_DIR):
+    """Wind speeds of storms in ``region``, drawn from ``region_wind``."""
+    return region_wind(region, cache_dir).sample(size, rng)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="parse best-track files into a cache")
+    build.add_argument("files", nargs="+")
+    build.add_argument("--out", default=DEFAULT_CACHE_DIR)
+    info = commands.add_parser("info", help="summarise a cache")
+    info.add_argument("--cache", default=DEFAULT_CACHE_DIR)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        n_points = build_cache(args.files, args.out)
+        print(f"Wrote {n_points:,} track points to {args.out}")
+    else:
+        archive = TrackArchive.open(args.cache)
+        print(f"{len(archive):,} points, {len(archive.storms):,} storms, {archive.years()} years")
+        for region, preset in REGIONS.items():
+            winds = archive.site_winds(preset.lat, preset.lon)
+            print(f"  {region}: {len(winds)} storms within {REGION_RADIUS_KM} km")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import threading
+import time
+
+from ocean_risk.leaderboard import Leaderboard
+from ocean_risk.state import GameState
+
+
+def test_writer_survives_an_undecodable_entry(tmp_path):
+    board = Leaderboard(tmp_path / "leaderboard.sqlite3")
+    board.pending.put((time.time(), b"not a game"))
+    board.submit(GameState(seed=1))
+
+    flushed = threading.Thread(target=board.flush, daemon=True)
+    flushed.start()
+    flushed.join(timeout=10)
+    assert not flushed.is_alive()
+    assert board.writer.is_alive()
+
+    board.submit(GameState(seed=2))
+    board.flush()
+    assert board.games()[-1].seed == 2
+    board.close()
@@ -0,0 +1,43 @@
+import pytest
+
+from ocean_risk.core import WIND_MAX
+from ocean_risk.pricing import MIN_YEARS, SAMPLERS, simulate_policy_adaptive
+from ocean_risk.rng import stream
+
+
+@pytest.mark.parametrize("sampler", SAMPLERS)
+def test_adaptive_samplers_run_without_rng(sampler):
+    stats = simulate_policy_adaptive(500, "High", 5, 50, 160, sampler=sampler)
+    assert stats.converged
+    assert stats.std_error <= 0.005 * stats.expected_payout
+
+
+@pytest.mark.parametrize("sampler", SAMPLERS)
+def test_adaptive_samplers_agree_with_exact_payout(sampler):
+    # High risk storms arrive with chance 0.8 (see RISK_CHANCES); 21 of the 111 wind speeds reach 160.
+    exact = 0.8 * 21 / 111 * 250
+    stats = simulate_policy_adaptive(500, "High", 5, 50, 160, tolerance=0.002, sampler=sampler, rng=stream(1))
+    assert stats.expected_payout == pytest.approx(exact, abs=4 * stats.std_error)
+
+
+def test_adaptive_flags_year_limit():
+    stats = simulate_policy_adaptive(500, "Low", 5, 50, 160, tolerance=1e-6, sampler="plain",
+                                     chunk_years=10_000, max_years=30_000, rng=stream(1))
+    assert not stats.converged
+    assert stats.n_years == 30_000
+
+
+@pytest.mark.parametrize("sampler", SAMPLERS)
+def test_adaptive_needs_payouts_before_converging(sampler):
+    # Low risk storms arrive with chance 0.2 and 21 of 111 wind speeds reach 160: one year in ~28 pays.
+    exact = 0.2 * 21 / 111 * 250
+    stats = simulate_policy_adaptive(500, "Low", 5, 50, 160, sampler=sampler, chunk_years=50, rng=stream(3))
+    assert stats.converged
+    assert stats.n_years >= MIN_YEARS
+    assert stats.expected_payout == pytest.approx(exact, abs=4 * stats.std_error)
+
+
+def test_adaptive_trigger_above_every_storm_is_free():
+    stats = simulate_policy_adaptive(500, "High", 5, 50, WIND_MAX + 1, rng=stream(0))
+    assert stats.converged
+    assert stats.expected_payout == 0
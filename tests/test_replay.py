@@ -0,0 +1,48 @@
+import numpy as np
+
+from ocean_risk.core import GAME_MODE_RULES, GAME_YEARS, ROLES, V3_RULES
+from ocean_risk.regions import REGIONS
+from ocean_risk.replay import SessionBatch, verify
+from ocean_risk.state import GameState
+
+SLIDERS = [(5, 60, 110), (15, 100, 80), (1, 20, 160), (8, 40, 130), (3, 90, 95)]
+
+
+def _play(game, rules=V3_RULES):
+    for premium, payout, trigger in SLIDERS[:GAME_YEARS]:
+        game.play_year(premium, payout, trigger, rules)
+    return game
+
+
+def _region_games():
+    games = []
+    for seed in range(4):
+        for role, region in zip(ROLES * len(REGIONS), REGIONS):
+            game = GameState(seed=seed)
+            game.start(region, role)
+            game.round = 1
+            games.append(_play(game))
+    return games
+
+
+def test_games_round_trip_through_bytes():
+    for game in _region_games():
+        assert GameState.from_bytes(game.to_bytes()) == game
+
+
+def test_decoded_games_replay_exactly():
+    games = [GameState.from_bytes(game.to_bytes()) for game in _region_games()]
+    assert verify(SessionBatch.from_games(games)).all()
+
+
+def test_single_region_games_replay_exactly():
+    games = [_play(GameState(round=1, storm_chance=0.6, reef_value=500, seed=seed), GAME_MODE_RULES)
+             for seed in range(8)]
+    batch = SessionBatch.from_games(GameState.from_bytes(game.to_bytes()) for game in games)
+    assert verify(batch, GAME_MODE_RULES).all()
+
+
+def test_verify_flags_a_tampered_game():
+    games = _region_games()
+    games[1].score += 1
+    assert verify(SessionBatch.from_games(games)).tolist() == [i != 1 for i in range(len(games))]
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from ocean_risk.spatial import GridIndex, haversine_km
+
+
+def _brute_force(lats, lons, point_lat, point_lon, radius_km):
+    distance = haversine_km(lats[:, None], lons[:, None], point_lat[None, :], point_lon[None, :])
+    site, point = np.nonzero(distance <= radius_km)
+    return set(zip(site.tolist(), point.tolist()))
+
+
+@pytest.mark.parametrize("radius_km", [50, 200, 1000])
+def test_query_many_matches_brute_force(radius_km):
+    rng = np.random.default_rng(radius_km)
+    # Uniform on the sphere, plus extra points crowded near both poles and the date line.
+    point_lat = np.concatenate([np.degrees(np.arcsin(rng.uniform(-1, 1, 3000))),
+                                rng.uniform(85, 90, 500), rng.uniform(-90, -85, 500), rng.uniform(-60, 60, 500)])
+    point_lon = np.concatenate([rng.uniform(-180, 180, 4000), rng.uniform(178, 180, 250),
+                                rng.uniform(-180, -178, 250)])
+    lats = np.concatenate([rng.uniform(-90, 90, 200), rng.uniform(87, 90, 50), rng.uniform(-90, -87, 50)])
+    lons = rng.uniform(-180, 180, 300)
+
+    index = GridIndex(point_lat, point_lon)
+    site, point = index.query_many(lats, lons, radius_km)
+    assert set(zip(site.tolist(), point.tolist())) == _brute_force(lats, lons, point_lat, point_lon,
+                                                                   radius_km)
+
+
+def test_query_reaches_over_the_pole():
+    index = GridIndex([89.81], [155.6])
+    assert index.query(88.77, 19.6, 200).tolist() == [0]
@@ -0,0 +1,22 @@
+import pytest
+
+from ocean_risk.basis import build_basis_surface
+from ocean_risk.rng import stream
+from ocean_risk.surface import PAYOUT_MAX, PAYOUT_MIN, TRIGGER_MAX, TRIGGER_MIN, build_premium_surface
+
+
+def test_premium_lookup_covers_the_slider_corners():
+    surface = build_premium_surface("Medium", n_years=10_000, rng=stream(0))
+    for trigger in (TRIGGER_MIN, TRIGGER_MAX):
+        for payout in (PAYOUT_MIN, PAYOUT_MAX):
+            premium, probability = surface.lookup(trigger, payout)
+            assert premium == pytest.approx(probability * payout)
+
+
+@pytest.mark.parametrize("trigger, payout", [(TRIGGER_MIN - 1, 50), (TRIGGER_MAX + 1, 50),
+                                             (100, PAYOUT_MIN - 1), (100, PAYOUT_MAX + 1)])
+def test_lookups_outside_the_grid_raise(trigger, payout):
+    with pytest.raises(ValueError):
+        build_premium_surface("Medium", n_years=1_000, rng=stream(0)).lookup(trigger, payout)
+    with pytest.raises(ValueError):
+        build_basis_surface("Belize", n_years=1_000, rng=stream(0)).lookup(trigger, payout)
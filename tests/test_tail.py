@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from ocean_risk.tail import DiscreteLoss, exact_tail_risk, simulate_tail_risk
+
+
+def test_discrete_quantiles_and_tvar():
+    loss = DiscreteLoss([0, 10, 20, 10], [0.9, 0.04, 0.01, 0.05])
+    assert loss.quantile(0.9) == 0
+    assert loss.quantile(0.95) == 10
+    assert loss.return_period_loss(100) == 10
+    assert loss.quantile(0.995) == 20
+    assert loss.tail_mean(0.98) == pytest.approx((0.01 * 20 + 0.01 * 10) / 0.02)
+
+
+def test_exact_tail_risk_matches_simulation():
+    exact = exact_tail_risk(500, "Medium", 60, 100)
+    simulated = simulate_tail_risk(500, "Medium", 60, 100, n_years=2_000_000, seed=0)
+    for years in (10, 100, 250):
+        np.testing.assert_allclose(exact.return_period_losses()[years],
+                                   simulated.return_period_losses()[years], rtol=0.02)
+    np.testing.assert_allclose(exact.tvar(100), simulated.tvar(100), rtol=0.02)
@@ -0,0 +1,42 @@
+import io
+import math
+
+import pytest
+
+from ocean_risk.tracks import parse_hurdat2, parse_ibtracs
+
+HURDAT2 = """\
+AL011851,            UNNAMED,     3,
+18510625, 0000,  , HU, 28.0N,  94.8W,  80, -999, -999, -999, -999, -999,
+18510625, 1200, L, HU, 28.2N,  96.0W,  70, -999, -999, -999, -999, -999,
+18510626, 0600,  , TS, 29.0S, 179.5E, -99, -999, -999, -999, -999, -999,
+AL021851,            UNNAMED,     1,
+18510705, 1200,  , HU, 22.2N,  97.6W,  80, -999, -999, -999, -999, -999,
+"""
+
+IBTRACS = """\
+SID,SEASON,NAME,ISO_TIME,LAT,LON,WMO_WIND,USA_WIND
+ ,Year, ,,degrees_north,degrees_east,kts,kts
+2004223N11301,2004,CHARLEY,2004-08-13 18:00:00,26.6,-82.2,125,130
+2004223N11301,2004,CHARLEY,2004-08-14 00:00:00,27.6,278.1,110,
+2004223N11301,2004,CHARLEY,2004-08-14 06:00:00,29.0,-81.0,,
+"""
+
+
+def test_parse_hurdat2():
+    points = list(parse_hurdat2(io.StringIO(HURDAT2)))
+    assert [p[:2] for p in points] == [("AL011851", "UNNAMED")] * 3 + [("AL021851", "UNNAMED")]
+    assert points[0][2:] == ("1851-06-25T00:00", 28.0, -94.8, 80.0)
+    assert points[1][2] == "1851-06-25T12:00"
+    storm_key, name, iso_time, lat, lon, wind = points[2]
+    assert (lat, lon) == (-29.0, 179.5)
+    assert math.isnan(wind)  # -99 marks a missing wind
+
+
+def test_parse_ibtracs():
+    points = list(parse_ibtracs(io.StringIO(IBTRACS)))  # the units row is skipped
+    assert len(points) == 3
+    assert points[0] == ("2004223N11301", "CHARLEY", "2004-08-13T18:00:00", 26.6, -82.2, 130.0)
+    assert points[1][4] == pytest.approx(-81.9)  # longitudes wrap to -180..180
+    assert points[1][5] == 110.0  # WMO_WIND when USA_WIND is blank
+    assert math.isnan(points[2][5])
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from ocean_risk.spatial import KM_PER_DEGREE
+from ocean_risk.windfield import holland_wind, radius_of_max_wind, site_max_wind
+
+SITE_LAT, SITE_LON = 32.3, -64.8  # Bermuda's reef
+
+
+def _track(offset_km, shift=0.0, vmax=120.0):
+    """A storm heading north 150 km per fix, passing ``offset_km`` east of the site."""
+    lat = SITE_LAT + (np.arange(-5, 6) + shift) * 150 / KM_PER_DEGREE
+    lon = np.full(lat.shape, SITE_LON + offset_km / (KM_PER_DEGREE * np.cos(np.radians(SITE_LAT))))
+    return np.zeros(lat.shape, dtype=int), lat, lon, np.full(lat.shape, vmax)
+
+
+@pytest.mark.parametrize("shift", [0.0, 0.1, 0.5])
+def test_direct_hit_reaches_max_wind(shift):
+    # With shift 0 a fix sits on the reef (in the eye); otherwise the fixes straddle it.
+    wind = site_max_wind(*_track(0, shift), [SITE_LAT], [SITE_LON])
+    assert wind[0, 0] == pytest.approx(120, rel=0.01)
+
+
+@pytest.mark.parametrize("offset_km", [100, 300])
+def test_passing_storm_peaks_at_closest_approach(offset_km):
+    wind = site_max_wind(*_track(offset_km, 0.5), [SITE_LAT], [SITE_LON])
+    expected = holland_wind(offset_km, 120, radius_of_max_wind(120, SITE_LAT))
+    assert wind[0, 0] == pytest.approx(expected, rel=0.01)
+
+
+def test_unconnected_fixes_are_not_joined():
+    storm_id, lat, lon, vmax = _track(0, 0.5)
+    connected = np.ones(len(lat) - 1, dtype=bool)
+    connected[4] = False  # between the fixes either side of the reef, 75 km away
+    wind = site_max_wind(storm_id, lat, lon, vmax, [SITE_LAT], [SITE_LON], connected=connected)
+    assert wind[0, 0] < 100
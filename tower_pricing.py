@@ -0,0 +1,112 @@
+import altair as alt
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from ocean_risk import REGIONS
+from ocean_risk.instrumentation import rerun_timer
+from ocean_risk.portfolio import example_portfolio, simulate_portfolio
+from ocean_risk.rng import SHARED_SEED, TOWER, stream
+from ocean_risk.tower import Tower, price_tower, region_annual_losses
+
+timer = rerun_timer(__file__)
+timer.section("setup")
+
+st.set_page_config(page_title="🏗️ YLOG Reinsurance Tower", layout="wide")
+
+N_YEARS = 200_000
+PORTFOLIO = "Portfolio of 1,000 insured sites"
+
+
+# Simulated once per loss source and shared by every session.
+@st.cache_resource
+def annual_losses(source):
+    if source == PORTFOLIO:
+        portfolio = example_portfolio(rng=stream(SHARED_SEED))
+        return simulate_portfolio(portfolio, N_YEARS // 2, SHARED_SEED).annual_payout
+    return region_annual_losses(source, N_YEARS, stream(SHARED_SEED, TOWER, REGIONS[source].id))
+
+
+st.title("🏗️ Pricing a Reinsurance Tower")
+st.markdown("A trust fund rarely keeps all of its storm risk. It passes **layers** of it to reinsurers "
+            "or to investors through **cat bonds**: each layer pays the part of a year's loss between "
+            "its **attachment** and its **exhaustion** point.")
+
+# --- Losses ---
+timer.section("losses")
+source = st.selectbox("🌍 Losses to protect", [*REGIONS, PORTFOLIO])
+losses = annual_losses(source)
+col1, col2, col3 = st.columns(3)
+col1.metric("Expected annual loss", f"${losses.mean():,.1f}M")
+col2.metric("1-in-100 year loss", f"${np.quantile(losses, 0.99):,.1f}M")
+col3.metric("Worst simulated year", f"${losses.max():,.1f}M")
+if source == PORTFOLIO:
+    st.caption(f"Parametric payouts owed across the portfolio in {len(losses):,} simulated years.")
+else:
+    st.caption(f"Reef damage from the region's storms in {len(losses):,} simulated years.")
+
+# --- Tower ---
+timer.section("tower")
+st.header("🧱 Build the Tower")
+top_loss = int(np.ceil(losses.max()))
+col1, col2 = st.columns(2)
+with col1:
+    retention, top = st.slider("Retention and top of the tower ($M)", 0, top_loss,
+                               (round(top_loss * 0.1), round(top_loss * 0.8)))
+    n_layers = st.slider("Number of layers", 1, 50, 5)
+with col2:
+    share = st.slider("Share of each layer placed (%)", 10, 100, 100) / 100
+    risk_load = st.slider("Risk load (× standard deviation)", 0.0, 1.0, 0.3, 0.05)
+
+if top <= retention:
+    st.warning("The top of the tower must be above the retention.")
+    timer.finish()
+    st.stop()
+
+tower = Tower.stacked(retention, top, n_layers, share=share)
+pricing = price_tower(tower, losses, risk_load=risk_load)
+
+# --- Results ---
+timer.section("results")
+st.header("💵 Layer Prices")
+layers = pd.DataFrame({
+    "Layer": [f"{a:,.0f}–{e:,.0f}" for a, e in zip(tower.attachment, tower.exhaustion)],
+    "Attachment ($M)": tower.attachment,
+    "Limit ($M)": tower.limit * tower.share,
+    "Expected loss ($M)": pricing.expected_loss,
+    "Chance of attaching": pricing.attachment_probability,
+    "Chance of exhausting": pricing.exhaustion_probability,
+    "Premium ($M)": pricing.technical_premium,
+    "Rate on line": pricing.rate_on_line,
+})
+st.dataframe(layers.style.format({
+    "Attachment ($M)": "{:,.1f}",
+    "Limit ($M)": "{:,.1f}",
+    "Expected loss ($M)": "{:,.2f}",
+    "Chance of attaching": "{:.2%}",
+    "Chance of exhausting": "{:.2%}",
+    "Premium ($M)": "{:,.2f}",
+    "Rate on line": "{:.1%}",
+}), hide_index=True)
+
+chances = layers.melt(id_vars=["Layer", "Attachment ($M)"],
+                      value_vars=["Chance of attaching", "Chance of exhausting"],
+                      var_name="Event", value_name="Chance per year")
+chart = alt.Chart(chances).mark_line(point=True).encode(
+    x=alt.X("Attachment ($M):Q"),
+    y=alt.Y("Chance per year:Q", scale=alt.Scale(type="symlog", constant=0.001), axis=alt.Axis(format="%")),
+    color="Event:N",
+    tooltip=["Layer", "Event", alt.Tooltip("Chance per year:Q", format=".2%")],
+)
+st.altair_chart(chart)
+
+retained = losses.mean() - pricing.expected_loss.sum()
+st.markdown(f"- **Total premium for the tower**: `${pricing.technical_premium.sum():,.2f} million` a year")
+st.markdown(f"- **Expected loss the fund keeps**: `${retained:,.2f} million` a year")
+st.caption("Higher layers attach rarely, so their expected loss is small, but investors still ask for "
+           "a risk load: their rate on line falls more slowly than their expected loss.")
+
+st.markdown("---")
+st.caption("Designed for the Young Leaders in Ocean Governance Program • Powered by AXA & TNC case studies")
+
+timer.finish()